@@ -36,6 +36,10 @@
 #define	UNICORND_CMD_SET_PIXEL      1
 #define	UNICORND_CMD_SET_ALL_PIXELS 2
 #define	UNICORND_CMD_SHOW           3
+#define	UNICORND_CMD_SET_PRIORITY   4
+#define	UNICORND_CMD_SET_PIXELS     5
+#define	UNICORND_CMD_SET_ALL_PIXELS_RLE 6
+#define	UNICORND_CMD_SHOW_SEQUENCE  7
 
 #define recv_or_return(socket, buf, len, flags) \
 {                                               \
@@ -59,6 +63,16 @@ typedef struct pos_s {
 	uint8_t y;
 } __attribute__ ((packed)) pos_t;
 
+typedef struct indexed_col_s {
+	uint8_t pos;
+	col_t col;
+} __attribute__ ((packed)) indexed_col_t;
+
+typedef struct run_s {
+	uint8_t len;
+	col_t col;
+} __attribute__ ((packed)) run_t;
+
 static void
 unicornd_exit(int status)
 {
@@ -175,7 +189,13 @@ handle_client(int client_socket) {
 
 	col_t pixels[64];
 	
-	int x, y;
+	uint8_t count;
+	int8_t priority;
+	uint32_t sequence;
+	indexed_col_t changes[64];
+	run_t runs[64];
+
+	int x, y, i, j, offset, total;
 
 	while (true) {
 		recv_or_return(client_socket, &cmd, sizeof(char), 0);
@@ -213,6 +233,69 @@ handle_client(int client_socket) {
 				show();
 				break;
 
+			case UNICORND_CMD_SET_PRIORITY:
+
+				/* only one client at a time, so nothing to layer */
+				recv_or_return(client_socket, &priority, sizeof(int8_t), 0);
+				break;
+
+			case UNICORND_CMD_SET_PIXELS:
+
+				recv_or_return(client_socket, &count, sizeof(uint8_t), 0);
+				if (count > 64) {
+					close(client_socket);
+					return;
+				}
+				if (count == 0) {
+					break;
+				}
+
+				recv_or_return(client_socket, &changes, count * sizeof(indexed_col_t), MSG_WAITALL);
+
+				for (i = 0; i < count; i++) {
+					if (changes[i].pos < 64) {
+						col_t *col = &changes[i].col;
+						setPixelColor(get_pixel_pos(changes[i].pos / 8, changes[i].pos % 8), col->r, col->g, col->b);
+					}
+				}
+
+				break;
+
+			case UNICORND_CMD_SET_ALL_PIXELS_RLE:
+
+				recv_or_return(client_socket, &count, sizeof(uint8_t), 0);
+				if (count == 0 || count > 64) {
+					close(client_socket);
+					return;
+				}
+
+				recv_or_return(client_socket, &runs, count * sizeof(run_t), MSG_WAITALL);
+
+				total = 0;
+				for (i = 0; i < count; i++) {
+					total += runs[i].len;
+				}
+				if (total != 64) {
+					close(client_socket);
+					return;
+				}
+
+				offset = 0;
+				for (i = 0; i < count; i++) {
+					for (j = 0; j < runs[i].len; j++, offset++) {
+						setPixelColor(get_pixel_pos(offset / 8, offset % 8), runs[i].col.r, runs[i].col.g, runs[i].col.b);
+					}
+				}
+
+				break;
+
+			case UNICORND_CMD_SHOW_SEQUENCE:
+
+				recv_or_return(client_socket, &sequence, sizeof(uint32_t), MSG_WAITALL);
+
+				show();
+				break;
+
 			default:
 
 				close(client_socket);
@@ -10,6 +10,7 @@ setup(
 	url = 'https://github.com/pimoroni/ws2812-RPi/',
 	description = """The Python library for UnicornHat a matrix of 64, eye-burning, ws2812 LEDs!""",
 	long_description=open('README').read() + open('CHANGELOG').read(),
-	py_modules = [ 'unicornhat' ],
+	packages = [ 'unicornhat' ],
 	install_requires = ['rpi_ws281x >= 1.0.1'],
+	extras_require = {'numpy': ['numpy']},
 )
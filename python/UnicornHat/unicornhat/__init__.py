@@ -0,0 +1,906 @@
+import atexit, itertools, operator, os, time
+
+# LED strip configuration:
+LED_COUNT      = 64      # Number of LED pixels, set by layout().
+LED_PIN        = 18      # GPIO pin connected to the pixels (must support PWM!).
+LED_FREQ_HZ    = 800000  # LED signal frequency in hertz (usually 800khz)
+LED_DMA        = 5       # DMA channel to use for generating signal (try 5)
+LED_BRIGHTNESS = 255     # Set to 0 for darkest and 255 for brightest
+LED_INVERT     = False   # True to invert the signal (when using NPN transistor level shift)
+
+'''
+Store the output backend and brightness, the backend
+defaults to rpi_ws281x unless the UNICORNHAT_BACKEND
+environment variable names another, see set_backend().
+Nothing touches the hardware until begin() is called,
+either directly or by the first show().
+'''
+_backend = None
+_backend_name = None
+_begun = False
+_strips = []
+_brightness = LED_BRIGHTNESS
+
+def clean_shutdown():
+  '''
+  Registered at exit to ensure the backend cleans up after
+  itself and all pixels are turned off.
+  '''
+  if _begun:
+    off()
+    _backend.cleanup()
+
+atexit.register(clean_shutdown)
+
+'''
+Store the display buffer as r, g, b bytes for
+every pixel in LED order, show() passes it to
+the backend in a single call.
+'''
+_buffer = bytearray(LED_COUNT * 3)
+
+'''
+Store a copy of the last frame sent to the backend so
+show() can skip the hardware update when the buffer
+hasn't changed, along with counts of the frames
+rendered and skipped.
+'''
+_shown = None
+_frames_rendered = 0
+_frames_skipped = 0
+
+'''
+Store the colour correction applied as frames are sent
+out, gamma, white balance and curve tables, combined into
+a 256 entry lookup table per channel whenever one of them
+changes. _luts is None while they leave colours unchanged.
+The display buffer itself always holds the colours drawn.
+'''
+_gamma = 1.0
+_white_balance = (1.0, 1.0, 1.0)
+_curves = None
+_luts = None
+_corrected = bytearray(LED_COUNT * 3)
+
+'''
+Store a high bit depth frame set with set_pixels(), r, g, b
+floats from 0.0 to 255.0 in LED order, shown through a temporal
+dither, along with the display buffer as it was when the frame
+was set. Once anything else is drawn the buffer no longer
+matches and show() goes back to the 8 bit buffer.
+'''
+_deep = None
+_deep_leds = None
+_dither = None
+_dithering = True
+
+'''
+Store the rotation of UnicornHat, defaults to
+0 wwhich places 0,0 on the top left with the B+
+HDMI port facing downwards
+'''
+_rotation = 0
+
+
+'''
+Store a map of pixel indexes for
+translating x, y coordinates.
+'''
+map = [
+  [7 ,6 ,5 ,4 ,3 ,2 ,1 ,0 ],
+  [8 ,9 ,10,11,12,13,14,15],
+  [23,22,21,20,19,18,17,16],
+  [24,25,26,27,28,29,30,31],
+  [39,38,37,36,35,34,33,32],
+  [40,41,42,43,44,45,46,47],
+  [55,54,53,52,51,50,49,48],
+  [56,57,58,59,60,61,62,63]
+]
+
+'''
+Store the layout of UnicornHats making up the display, see
+layout(). _layout_index translates a position on the display
+before rotation (y * width + x) into a pixel index, and
+_width and _height are the size of the display after rotation.
+'''
+_layout = None
+_layout_shape = (8, 8)
+_layout_index = None
+_width = 8
+_height = 8
+
+'''
+Flat lookup tables translating a display position
+(y * width + x) into a pixel index, one per rotation.
+Built on demand by rotation() so set_pixel doesn't
+have to flip and rotate coordinates on every call.
+'''
+_index_tables = {}
+_index = None
+_index_array = None
+_reorder_tables = {}
+
+def _rotate_xy(x, y, r):
+  '''
+  Translate an x, y position into a pixel index
+  for rotation r, used to build the lookup tables
+  '''
+  y = 7-y
+
+  if r == 90:
+    x,y = y,7-x
+  if r == 180:
+    x,y = 7-x,7-y
+  if r == 270:
+    x,y = 7-y,x
+
+  return map[x][y]
+
+def _get_index_table(r):
+  '''
+  Get the lookup table for rotation r, along with the
+  width and height of the display at that rotation
+  '''
+  if r not in _index_tables:
+    width, height = _layout_shape
+    if r in [90, 270]:
+      shape = (height, width)
+    else:
+      shape = (width, height)
+    table = []
+    for y in range(shape[1]):
+      for x in range(shape[0]):
+        # Position on the display before rotation
+        u, v = x, y
+        if r == 90:
+          u, v = width - 1 - y, x
+        elif r == 180:
+          u, v = width - 1 - x, height - 1 - y
+        elif r == 270:
+          u, v = y, height - 1 - x
+        table.append(_layout_index[(v * width) + u])
+    _index_tables[r] = (table, shape[0], shape[1])
+  return _index_tables[r]
+
+def rotation(r = 0):
+  global _rotation, _index, _index_array, _width, _height
+  '''
+  Set the display rotation valid values:
+  0
+  90
+  180
+  270
+  90 and 270 swap the width and height of a display
+  that isn't square, see get_shape()
+  '''
+  if r in [0,90,180,270]:
+    _index, _width, _height = _get_index_table(r)
+    _rotation = r
+    _index_array = None
+    return True
+  else:
+    raise ValueError('Rotation must be 0, 90, 180 or 270 degrees')
+    return
+
+def get_rotation():
+  '''
+  Get the display rotation in degrees
+  '''
+  return _rotation
+
+def get_shape():
+  '''
+  Get the width and height of the display in pixels
+  '''
+  return (_width, _height)
+
+def layout(columns = 1, rows = 1, rotations = None, order = 'rows', serpentine = False):
+  global LED_COUNT, _layout, _layout_shape, _layout_index, _shown, _deep, _dither
+  '''
+  Set how UnicornHats are chained into one display, a grid
+  of columns x rows hats, each 8 pixels square
+
+  The chain starts with the top left hat and runs along each
+  row in turn, or down each column if order is 'columns'. With
+  serpentine True every other row, or column, runs back the
+  other way. rotations gives the rotation in degrees of each
+  hat in chain order, for hats mounted turned round.
+
+  The lookup tables are built once here, and the buffer is
+  resized and cleared. A backend set by name is set up again
+  for the new number of pixels, but only before it's started,
+  so set the layout before the first show().
+  '''
+  if columns < 1 or rows < 1:
+    raise ValueError('Layout must have at least one column and one row')
+  if order not in ['rows', 'columns']:
+    raise ValueError("Order must be 'rows' or 'columns'")
+  count = columns * rows
+  if rotations is None:
+    rotations = [0] * count
+  rotations = tuple(rotations)
+  if len(rotations) != count or any(r not in [0, 90, 180, 270] for r in rotations):
+    raise ValueError('Rotations must be 0, 90, 180 or 270 degrees for each of the {0} hats'.format(count))
+  if _backend is not None and _backend.count != count * 64 and (_begun or _backend_name is None):
+    raise ValueError('The backend drives {0} pixels, set the layout before it starts'.format(_backend.count))
+
+  # Position in the chain of the hat at each column, row
+  chain = {}
+  for position in range(count):
+    if order == 'rows':
+      row, column = divmod(position, columns)
+      if serpentine and row % 2:
+        column = columns - 1 - column
+    else:
+      column, row = divmod(position, rows)
+      if serpentine and column % 2:
+        row = rows - 1 - row
+    chain[(column, row)] = position
+
+  width = columns * 8
+  height = rows * 8
+  index = []
+  for y in range(height):
+    for x in range(width):
+      position = chain[(x // 8, y // 8)]
+      index.append((position * 64) + _rotate_xy(x % 8, y % 8, rotations[position]))
+
+  # Make the new backend before changing anything, so a
+  # backend that can't drive the layout leaves it as it was
+  backend = None
+  if _backend is not None and _backend.count != count * 64:
+    backend = _create_backend(_backend_name, count * 64, index)
+
+  LED_COUNT = count * 64
+  _layout = (columns, rows, rotations, order, serpentine)
+  _layout_shape = (width, height)
+  _layout_index = index
+  _buffer[:] = bytearray(LED_COUNT * 3)
+  _corrected[:] = bytearray(LED_COUNT * 3)
+  _index_tables.clear()
+  _reorder_tables.clear()
+  _shown = None
+  _deep = None
+  _dither = None
+  rotation(_rotation)
+  if backend is not None:
+    _use_backend(backend, _backend_name)
+
+def get_layout():
+  '''
+  Get the layout as columns, rows, rotations, order
+  and serpentine, the arguments to layout()
+  '''
+  return _layout
+
+layout()
+
+def set_backend(backend = 'rpi_ws281x'):
+  '''
+  Set the output backend, either a Backend instance
+  or one of the names:
+  rpi_ws281x - UnicornHat through the rpi_ws281x library
+  ws2812 - UnicornHat through the legacy ws2812 module
+  emulator - the UnicornHat emulator, over TCP
+  unicornd - the unicornd daemon, over its Unix socket
+  simulator - in memory, see backends.Simulator
+
+  The backend is started by begin() or the first show()
+  '''
+  name = backend if backend in ['rpi_ws281x', 'ws2812', 'emulator', 'unicornd', 'simulator'] else None
+  return _use_backend(_create_backend(backend, LED_COUNT, _layout_index), name)
+
+def _create_backend(backend, count, order):
+  # Make a backend by name for count pixels, order maps x, y
+  # to LEDs, and give it the strips, without using it yet
+  from . import backends
+
+  if backend == 'rpi_ws281x':
+    backend = backends.RpiWs281x(count, LED_PIN, LED_FREQ_HZ, LED_DMA, LED_INVERT, LED_BRIGHTNESS)
+  elif backend == 'ws2812':
+    backend = backends.Ws2812(count)
+  elif backend == 'emulator':
+    if count != 64:
+      raise ValueError('The emulator shows a single UnicornHat')
+    backend = backends.Emulator(count, order)
+  elif backend == 'unicornd':
+    backend = backends.Unicornd(count)
+  elif backend == 'simulator':
+    backend = backends.Simulator(count, LED_FREQ_HZ)
+  elif not isinstance(backend, backends.Backend):
+    raise ValueError('Backend must be rpi_ws281x, ws2812, emulator, unicornd, simulator or a Backend')
+
+  for strip in _strips:
+    backend.add_strip(strip)
+  return backend
+
+def _use_backend(backend, name):
+  global _backend, _backend_name, _begun, _shown, _dither
+  if _begun:
+    _backend.cleanup()
+  _backend = backend
+  _backend_name = name
+  _begun = False
+  _shown = None
+  # Dithering follows the new backend's transfer curve
+  _dither = None
+  return backend
+
+def get_backend():
+  '''
+  Get the output backend
+  '''
+  if _backend is None:
+    set_backend(os.environ.get('UNICORNHAT_BACKEND', 'rpi_ws281x'))
+  return _backend
+
+def begin():
+  global _begun
+  '''
+  Start the output backend, initialising UnicornHat
+
+  This happens automatically on the first show(), call
+  it yourself to set up the hardware ahead of time.
+  '''
+  if not _begun:
+    backend = get_backend()
+    backend.begin()
+    backend.set_brightness(_brightness)
+    _begun = True
+  return _backend
+
+def brightness(b = 0.2):
+  global _brightness, _shown
+  '''
+  Set the display brightness between 0.0 and 1.0
+  0.2 is highly recommended, UnicornHat can get painfully bright!
+  '''
+  if b > 1 or b < 0:
+    raise ValueError('Brightness must be between 0.0 and 1.0')
+    return
+  _brightness = int(b*255.0)
+  if _begun:
+    _backend.set_brightness(_brightness)
+  _shown = None
+
+def get_brightness():
+  '''
+  Get the display brightness value
+  Returns a float between 0.0 and 1.0
+  '''
+  return _brightness / 255.0
+
+def _build_luts():
+  global _luts, _shown
+  '''
+  Combine the curve, gamma and white balance into one
+  lookup table per channel
+  '''
+  luts = []
+  for channel in range(3):
+    curve = _curves[channel] if _curves is not None else range(256)
+    luts.append(bytes(bytearray(min(255, int(round(((curve[value] / 255.0) ** _gamma) * _white_balance[channel] * 255.0))) for value in range(256))))
+  identity = bytes(bytearray(range(256)))
+  _luts = None if all(lut == identity for lut in luts) else luts
+  _shown = None
+
+def gamma(g = 1.0):
+  global _gamma
+  '''
+  Set the gamma correction applied to every channel
+  as frames are sent out, 1.0 leaves colours unchanged
+
+  The rpi_ws281x and ws2812 drivers, and unicornd, which
+  uses ws2812, already gamma correct every byte by around
+  2.8, as does the simulator, see the backend's gamma, so
+  anything more on them crushes the dim end. Use around
+  2.2 with the emulator, which shows bytes as they are,
+  to make fades look even to the eye.
+  '''
+  if g <= 0:
+    raise ValueError('Gamma must be greater than 0')
+  _gamma = float(g)
+  _build_luts()
+
+def get_gamma():
+  '''
+  Get the gamma correction
+  '''
+  return _gamma
+
+def white_balance(r = 1.0, g = 1.0, b = 1.0):
+  global _white_balance
+  '''
+  Scale the red, green and blue channels as frames are
+  sent out, each between 0.0 and 1.0, to balance the
+  white point of the LEDs
+  '''
+  if any(value > 1 or value < 0 for value in (r, g, b)):
+    raise ValueError('White balance must be between 0.0 and 1.0')
+  _white_balance = (float(r), float(g), float(b))
+  _build_luts()
+
+def get_white_balance():
+  '''
+  Get the red, green and blue white balance
+  '''
+  return _white_balance
+
+def curve(r = None, g = None, b = None):
+  global _curves
+  '''
+  Set a custom curve for each channel, a list of 256
+  values from 0 to 255 that every channel value is looked
+  up in before gamma and white balance, such as a brightness
+  curve. g and b default to r, and curve() removes them.
+  '''
+  if r is None:
+    _curves = None
+  else:
+    curves = (r, r if g is None else g, r if b is None else b)
+    if any(len(table) != 256 or any(value > 255 or value < 0 for value in table) for table in curves):
+      raise ValueError('Curves must be 256 values between 0 and 255')
+    _curves = tuple(list(table) for table in curves)
+  _build_luts()
+
+def get_luts():
+  '''
+  Get the red, green and blue lookup tables colours
+  go through as frames are sent out, as 256 bytes each
+  '''
+  if _luts is None:
+    return [bytes(bytearray(range(256)))] * 3
+  return list(_luts)
+
+def dither(enabled = True):
+  global _dithering, _deep
+  '''
+  Turn temporal dithering of uint16 and float frames on or
+  off, when off they're rounded to the nearest byte
+  '''
+  _dithering = bool(enabled)
+  if not _dithering:
+    _deep = None
+
+def get_dither():
+  '''
+  Get whether uint16 and float frames are dithered
+  '''
+  return _dithering
+
+def clear():
+  '''
+  Clear the buffer
+  '''
+  _buffer[:] = bytearray(len(_buffer))
+
+def off():
+  '''
+  Clear the buffer, and any strips, and immediately
+  update UnicornHat to turn off all pixels.
+  '''
+  clear()
+  for strip in _strips:
+    strip.clear()
+  show(force=True)
+
+def _numpy():
+  '''
+  Import NumPy on first use, it's only
+  required for array frames
+  '''
+  import numpy
+  return numpy
+
+def _get_index_array():
+  global _index_array
+  '''
+  Get the lookup table for the current
+  rotation as a NumPy index array
+  '''
+  if _index_array is None:
+    _index_array = _numpy().array(_index, dtype='intp')
+  return _index_array
+
+def _get_reorder():
+  '''
+  Get a function picking the bytes of a row by row frame
+  out in LED order, for the current rotation
+  '''
+  if _rotation not in _reorder_tables:
+    position = dict((index, offset) for offset, index in enumerate(_index))
+    _reorder_tables[_rotation] = operator.itemgetter(*[(position[index] * 3) + channel for index in range(LED_COUNT) for channel in range(3)])
+  return _reorder_tables[_rotation]
+
+def get_index_from_xy(x, y):
+  '''
+  Convert an x, y value to an index on the display
+  '''
+  if x >= _width or x < 0:
+    raise ValueError('X position must be between 0 and {0}'.format(_width - 1))
+    return
+  if y >= _height or y < 0:
+    raise ValueError('Y position must be between 0 and {0}'.format(_height - 1))
+    return
+
+  return _index[(y * _width) + x]
+
+def set_pixel(x, y, r, g, b):
+  '''
+  Set a single pixel to RGB colour
+  '''
+  # One range check and one table lookup, get_index_from_xy()
+  # is only called to raise the error for a bad position
+  if not (0 <= x < _width and 0 <= y < _height):
+    get_index_from_xy(x, y)
+  index = _index[(y * _width) + x] * 3
+  _buffer[index:index + 3] = (r, g, b)
+
+def get_pixel(x, y):
+  '''
+  Get the RGB value of a single pixel
+  '''
+  if not (0 <= x < _width and 0 <= y < _height):
+    get_index_from_xy(x, y)
+  index = _index[(y * _width) + x] * 3
+  return tuple(_buffer[index:index + 3])
+
+def set_pixels(pixels):
+  '''
+  Set all pixels from a 2d array of (r, g, b) tuples indexed
+  as pixels[y][x], the same layout get_pixels() returns, 8x8
+  for a single UnicornHat or the size get_shape() returns.
+
+  pixels can also be a (height, width, 3) NumPy array, uint8 values are
+  used as is and integer types are clipped to 0-255. Arrays are
+  reordered into the display buffer with a single fancy index.
+
+  uint16 arrays, 0-65535, and float arrays, 0.0-255.0, keep their
+  extra precision and are dithered over time as they're shown,
+  see dither(), so slow fades and dim colours stay smooth even
+  at low brightness. show() sends a new frame every time while
+  one is set, keep calling it to keep dithering a still frame.
+
+  Or pixels can be r, g, b bytes row by row, 192 for 8x8, such as a
+  bytearray canvas, reordered into the buffer in one call.
+
+  The shape is validated once up front, after which every pixel
+  goes straight through the rotation lookup table.
+  '''
+  global _deep, _deep_leds
+  if hasattr(pixels, 'shape'):
+    numpy = _numpy()
+    if pixels.shape != (_height, _width, 3):
+      raise ValueError('Pixels must be a ({0}, {1}, 3) array'.format(_height, _width))
+    if _dithering and (pixels.dtype == numpy.uint16 or numpy.issubdtype(pixels.dtype, numpy.floating)):
+      scale = 255.0 / 65535.0 if pixels.dtype == numpy.uint16 else 1.0
+      deep = numpy.empty((LED_COUNT, 3))
+      deep[_get_index_array()] = numpy.clip(pixels.reshape(LED_COUNT, 3) * scale, 0, 255)
+      _deep = deep.reshape(-1)
+      _buffer[:] = numpy.floor(_deep + 0.5).astype(numpy.uint8).tobytes()
+      _deep_leds = bytes(_buffer)
+      return
+    if pixels.dtype == numpy.uint16:
+      pixels = (pixels.astype(numpy.uint32) + 128) // 257
+    elif numpy.issubdtype(pixels.dtype, numpy.floating):
+      pixels = numpy.floor(pixels + 0.5)
+    if pixels.dtype != numpy.uint8:
+      pixels = numpy.clip(pixels, 0, 255).astype(numpy.uint8)
+    _deep = None
+    leds = numpy.frombuffer(_buffer, dtype=numpy.uint8).reshape(LED_COUNT, 3)
+    leds[_get_index_array()] = pixels.reshape(LED_COUNT, 3)
+    return
+
+  if isinstance(pixels, (bytes, bytearray, memoryview)):
+    if len(pixels) != LED_COUNT * 3:
+      raise ValueError('Pixels must be {0} bytes'.format(LED_COUNT * 3))
+    _buffer[:] = bytearray(_get_reorder()(bytearray(pixels)))
+    return
+
+  if len(pixels) != _height or any(len(row) != _width for row in pixels):
+    raise ValueError('Pixels must be a {0}x{1} array of (r, g, b) tuples'.format(_width, _height))
+
+  for index, pixel in zip(_index, itertools.chain.from_iterable(pixels)):
+    _buffer[index * 3:(index * 3) + 3] = pixel
+
+def set_leds(leds):
+  '''
+  Set all pixels from r, g, b bytes in LED order, such
+  as a frame from a sprite cache, in a single copy
+  '''
+  if len(leds) != len(_buffer):
+    raise ValueError('LEDs must be {0} bytes'.format(len(_buffer)))
+  _buffer[:] = leds
+
+def get_leds():
+  '''
+  Get a copy of all pixels as r, g, b bytes in LED order
+  '''
+  return bytes(_buffer)
+
+def set_row(y, row):
+  '''
+  Set a whole row of pixels from a list of (r, g, b) tuples,
+  8 for a single UnicornHat
+  '''
+  if y >= _height or y < 0:
+    raise ValueError('Y position must be between 0 and {0}'.format(_height - 1))
+  if len(row) != _width:
+    raise ValueError('Row must contain {0} (r, g, b) tuples'.format(_width))
+
+  for index, pixel in zip(_index[y * _width:(y * _width) + _width], row):
+    _buffer[index * 3:(index * 3) + 3] = pixel
+
+def get_pixels(as_array=False):
+  '''
+  Get the RGB value of all pixels in a 2d array of tuples, 8x8
+  for a single UnicornHat, or a copy as a (height, width, 3)
+  uint8 NumPy array if as_array is True
+  '''
+  if as_array:
+    numpy = _numpy()
+    leds = numpy.frombuffer(bytes(_buffer), dtype=numpy.uint8).reshape(LED_COUNT, 3)
+    return leds[_get_index_array()].reshape(_height, _width, 3)
+
+  pixels = [tuple(_buffer[index * 3:(index * 3) + 3]) for index in _index]
+  return [pixels[y * _width:(y * _width) + _width] for y in range(_height)]
+
+def show(force=False, block=True):
+  global _shown, _frames_rendered, _frames_skipped, _deep, _dither
+  '''
+  Update UnicornHat with the contents
+  of the display buffer
+
+  The update is skipped if neither the buffer nor the
+  brightness has changed since the last one, unless
+  force is True or a uint16 or float frame is being
+  dithered. Returns True if UnicornHat was updated.
+
+  Strips added with add_strip() are sent out with
+  UnicornHat in the same transfer, and a change to
+  a strip updates both.
+
+  With block=False show() returns as soon as the frame
+  starts being sent out, so the next frame can be drawn
+  while it's on its way. The next show() or wait() waits
+  for it to finish.
+  '''
+  if _deep is not None and _buffer != _deep_leds:
+    _deep = None
+
+  if not force and _deep is None and _buffer == _shown and not any(strip._changed() for strip in _strips):
+    _frames_skipped += 1
+    return False
+
+  if not _begun:
+    begin()
+
+  frame = _buffer
+  if _deep is not None:
+    # Colour correction is done on the exact values,
+    # before the dither rounds them
+    if _dither is None:
+      from .dithering import Dither
+      _dither = Dither(LED_COUNT, _backend.transfer)
+    values = _dither.correct(_deep, _gamma, _white_balance, _curves)
+    frame = _dither.frame(values, _brightness)
+  elif _luts is not None:
+    # Three translate() calls correct every pixel at once
+    _corrected[0::3] = _buffer[0::3].translate(_luts[0])
+    _corrected[1::3] = _buffer[1::3].translate(_luts[1])
+    _corrected[2::3] = _buffer[2::3].translate(_luts[2])
+    frame = _corrected
+
+  _backend.show(frame, block)
+  _shown = bytes(_buffer)
+  for strip in _strips:
+    strip._shown = (bytes(strip.buffer), strip.level)
+  _frames_rendered += 1
+  return True
+
+def wait():
+  '''
+  Wait for the frame sent by show(block=False)
+  to finish updating UnicornHat
+  '''
+  if _begun:
+    _backend.wait()
+
+def get_frame_stats():
+  '''
+  Get the number of frames show() has sent to UnicornHat
+  and the number it skipped because nothing had changed
+  '''
+  return {'rendered': _frames_rendered, 'skipped': _frames_skipped}
+
+class Strip(object):
+  '''
+  A second string of WS2812 LEDs on the other PWM channel,
+  see add_strip()
+
+  buffer holds r, g, b bytes for each of its count LEDs, and
+  level is its brightness from 0 to 255, both separate from
+  UnicornHat's. Colour correction, dithering and layouts only
+  apply to UnicornHat, a strip's colours are sent as they are.
+  '''
+  def __init__(self, count, pin=13, brightness=0.2, invert=False):
+    if count < 1:
+      raise ValueError('A strip must have at least one LED')
+    self.count = count
+    self.pin = pin
+    self.invert = invert
+    self.buffer = bytearray(count * 3)
+    self.level = LED_BRIGHTNESS
+    self._shown = None
+    self.brightness(brightness)
+
+  def brightness(self, b = 0.2):
+    '''
+    Set the strip brightness between 0.0 and 1.0
+    '''
+    if b > 1 or b < 0:
+      raise ValueError('Brightness must be between 0.0 and 1.0')
+    self.level = int(b * 255.0)
+
+  def get_brightness(self):
+    '''
+    Get the strip brightness between 0.0 and 1.0
+    '''
+    return self.level / 255.0
+
+  def set_pixel(self, index, r, g, b):
+    '''
+    Set the LED at index along the strip to RGB colour
+    '''
+    if index >= self.count or index < 0:
+      raise ValueError('Index must be between 0 and {0}'.format(self.count - 1))
+    self.buffer[index * 3:(index * 3) + 3] = (r, g, b)
+
+  def get_pixel(self, index):
+    '''
+    Get the RGB value of the LED at index
+    '''
+    if index >= self.count or index < 0:
+      raise ValueError('Index must be between 0 and {0}'.format(self.count - 1))
+    return tuple(self.buffer[index * 3:(index * 3) + 3])
+
+  def set_leds(self, leds):
+    '''
+    Set every LED from r, g, b bytes in a single copy
+    '''
+    if len(leds) != len(self.buffer):
+      raise ValueError('LEDs must be {0} bytes'.format(len(self.buffer)))
+    self.buffer[:] = leds
+
+  def get_leds(self):
+    '''
+    Get a copy of every LED as r, g, b bytes
+    '''
+    return bytes(self.buffer)
+
+  def clear(self):
+    '''
+    Clear the strip's buffer
+    '''
+    self.buffer[:] = bytearray(len(self.buffer))
+
+  def _changed(self):
+    return self._shown is None or self._shown[1] != self.level or self._shown[0] != self.buffer
+
+def add_strip(count, pin=13, brightness=0.2, invert=False):
+  '''
+  Drive a second string of count LEDs from the other PWM
+  channel, on GPIO 13 or 19 as UnicornHat uses GPIO 18,
+  with its own buffer and brightness. Returns a Strip.
+
+  show() sends UnicornHat and the strip out in a single
+  transfer, so both update together for the cost of one.
+  Call it before the first show(), rpi_ws281x has two
+  channels so only one strip can be added, the simulator
+  takes any number.
+  '''
+  if _begun:
+    raise ValueError('Strips must be added before UnicornHat starts')
+  strip = Strip(count, pin, brightness, invert)
+  get_backend().add_strip(strip)
+  _strips.append(strip)
+  return strip
+
+def get_strips():
+  '''
+  Get the strips added with add_strip()
+  '''
+  return list(_strips)
+
+_monotonic = getattr(time, 'monotonic', time.time)
+
+class FrameLoop(object):
+  '''
+  Run an animation at a fixed frame rate
+
+  Frames are scheduled against a monotonic clock, frame n
+  is due at start + n / fps, so the rate doesn't drift with
+  how long each frame takes to draw. If a frame overruns its
+  slot the loop skips ahead to the next slot that's still in
+  the future rather than trying to catch up.
+
+  callback(step) is called with the slot number of each frame
+  and should draw it into the buffer, the loop calls show().
+  Return False from callback to stop the loop.
+  '''
+  def __init__(self, callback, fps=30):
+    if fps <= 0:
+      raise ValueError('FPS must be greater than 0')
+    self.callback = callback
+    self.period = 1.0 / fps
+    self.running = False
+    self.frames = 0
+    self.overruns = 0
+    self.skipped = 0
+    self.elapsed = 0.0
+    self.jitter = 0.0
+    self.max_jitter = 0.0
+
+  @property
+  def fps(self):
+    '''
+    Get the achieved frame rate
+    '''
+    if self.elapsed == 0:
+      return 0.0
+    return self.frames / self.elapsed
+
+  def stop(self):
+    '''
+    Stop the loop after the current frame
+    '''
+    self.running = False
+
+  def run(self, frames=None):
+    '''
+    Run the loop until the callback returns False,
+    stop() is called or, if given, after frames frames
+    '''
+    self.running = True
+    self.frames = self.overruns = self.skipped = 0
+    self.elapsed = self.jitter = self.max_jitter = 0.0
+    lateness = 0.0
+    step = 0
+    start = _monotonic()
+
+    while self.running and (frames is None or self.frames < frames):
+      deadline = start + (step * self.period)
+      now = _monotonic()
+      if now < deadline:
+        time.sleep(deadline - now)
+        now = _monotonic()
+
+      if self.callback(step) is False:
+        break
+      show()
+
+      lateness += now - deadline
+      self.max_jitter = max(self.max_jitter, now - deadline)
+      self.frames += 1
+      self.jitter = lateness / self.frames
+
+      step += 1
+      now = _monotonic()
+      self.elapsed = now - start
+      if now > start + (step * self.period):
+        # Overran into the next slot, skip to the next one still ahead
+        behind = int((now - start) / self.period) + 1 - step
+        self.overruns += 1
+        self.skipped += behind
+        step += behind
+
+    self.running = False
+    return self
+
+def run(callback, fps=30, frames=None):
+  '''
+  Call callback(step) to draw each frame and show it at a fixed
+  frame rate, see FrameLoop. Returns the FrameLoop so you can
+  check the achieved fps, jitter and overruns.
+  '''
+  return FrameLoop(callback, fps).run(frames)
@@ -0,0 +1,357 @@
+'''
+Output backends for unicornhat
+
+A backend takes the display buffer, r, g, b bytes for every
+pixel in LED order, and gets it onto some LEDs. unicornhat
+drives real hardware through rpi_ws281x or the legacy ws2812
+module, but can also send frames to the UnicornHat emulator
+or keep them in memory with the simulator, so animations can
+be run and benchmarked on any machine.
+'''
+import operator, socket, struct, time
+
+_monotonic = getattr(time, 'monotonic', time.time)
+
+'''
+The gamma table ws2811 looks every byte up in before scaling
+it by brightness, a copy of rpi-ws281x/lib/gamma.h, the
+ws2812 library unicornd uses has the same table
+'''
+WS281X_GAMMA = (
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2,
+  2, 2, 2, 3, 3, 3, 3, 3, 4, 4, 4, 4, 5, 5, 5, 5,
+  6, 6, 6, 7, 7, 7, 8, 8, 8, 9, 9, 9, 10, 10, 11, 11,
+  11, 12, 12, 13, 13, 13, 14, 14, 15, 15, 16, 16, 17, 17, 18, 18,
+  19, 19, 20, 21, 21, 22, 22, 23, 23, 24, 25, 25, 26, 27, 27, 28,
+  29, 29, 30, 31, 31, 32, 33, 34, 34, 35, 36, 37, 37, 38, 39, 40,
+  40, 41, 42, 43, 44, 45, 46, 46, 47, 48, 49, 50, 51, 52, 53, 54,
+  55, 56, 57, 58, 59, 60, 61, 62, 63, 64, 65, 66, 67, 68, 69, 70,
+  71, 72, 73, 74, 76, 77, 78, 79, 80, 81, 83, 84, 85, 86, 88, 89,
+  90, 91, 93, 94, 95, 96, 98, 99, 100, 102, 103, 104, 106, 107, 109, 110,
+  111, 113, 114, 116, 117, 119, 120, 121, 123, 124, 126, 128, 129, 131, 132, 134,
+  135, 137, 138, 140, 142, 143, 145, 146, 148, 150, 151, 153, 155, 157, 158, 160,
+  162, 163, 165, 167, 169, 170, 172, 174, 176, 178, 179, 181, 183, 185, 187, 189,
+  191, 193, 194, 196, 198, 200, 202, 204, 206, 208, 210, 212, 214, 216, 218, 220,
+  222, 224, 227, 229, 231, 233, 235, 237, 239, 241, 244, 246, 248, 250, 252, 255
+)
+
+def _scale_table(brightness, gamma=None):
+  '''
+  Build a translation table scaling every byte value
+  by brightness, the same way ws2811 does, looking it
+  up in gamma first if given
+  '''
+  if gamma is None:
+    gamma = range(256)
+  return bytes(bytearray(((gamma[value] * (brightness + 1)) >> 8) for value in range(256)))
+
+def _ws2812_transfer(brightness):
+  # The ws2812 library rounds gamma[value] * brightness,
+  # with brightness as 0.0 to 1.0
+  exact = [(WS281X_GAMMA[value] * brightness) / 255.0 for value in range(256)]
+  return exact, [int(level + 0.5) for level in exact]
+
+class Backend(object):
+  '''
+  Base class for unicornhat output backends
+
+  count is the number of LEDs, every buffer passed to
+  show() holds count * 3 bytes. gamma is the table the
+  output looks each byte up in before brightness, None
+  if it sends them on as they are.
+  '''
+  gamma = None
+
+  def __init__(self, count):
+    self.count = count
+    self.brightness = 255
+
+  def begin(self):
+    '''
+    Initialise the output, called once before the first show()
+    '''
+    pass
+
+  def set_brightness(self, brightness):
+    '''
+    Set the output brightness between 0 and 255
+    '''
+    self.brightness = brightness
+
+  def transfer(self, brightness):
+    '''
+    Get the light each byte value gives at brightness, as a
+    list of the exact level of each, 0.0 to 255.0, and a list
+    of the whole level the output really sends for each
+
+    By default bytes are looked up in gamma, if set, and then
+    scaled by brightness the way ws2811 does.
+    '''
+    gamma = self.gamma or range(256)
+    exact = [(gamma[value] * (brightness + 1)) / 256.0 for value in range(256)]
+    return exact, list(bytearray(_scale_table(brightness, self.gamma)))
+
+  def add_strip(self, strip):
+    '''
+    Drive a unicornhat.Strip as well, its buffer and level are
+    sent out by every show() along with buffer. Called before
+    begin(), backends with a single output raise ValueError.
+    '''
+    raise ValueError('The {0} backend drives a single string of LEDs'.format(type(self).__name__))
+
+  def show(self, buffer, block=True):
+    '''
+    Send buffer to the LEDs
+
+    If block is False return as soon as the frame is on its
+    way, the next show() or wait() waits for it to finish.
+    '''
+    raise NotImplementedError
+
+  def wait(self):
+    '''
+    Wait for the last frame sent by show() to finish
+    '''
+    pass
+
+  def cleanup(self):
+    '''
+    Release the output, called at exit
+    '''
+    pass
+
+class RpiWs281x(Backend):
+  '''
+  Drive the LEDs with the rpi_ws281x library through neopixel
+  '''
+  gamma = WS281X_GAMMA
+
+  def __init__(self, count, pin=18, freq_hz=800000, dma=5, invert=False, brightness=255):
+    from neopixel import Adafruit_NeoPixel
+    Backend.__init__(self, count)
+    self.brightness = brightness
+    self.neopixel = Adafruit_NeoPixel(count, pin, freq_hz, dma, invert, brightness)
+    self.strips = []
+
+  def begin(self):
+    self.neopixel.begin()
+
+  def set_brightness(self, brightness):
+    Backend.set_brightness(self, brightness)
+    self.neopixel.setBrightness(brightness)
+
+  def add_strip(self, strip):
+    # The strip gets the other PWM channel, rendered along
+    # with the first by the same ws2811_render()
+    try:
+      channel = self.neopixel.addChannel(strip.count, strip.pin, strip.invert, strip.level)
+    except RuntimeError as error:
+      raise ValueError(str(error))
+    self.strips.append((channel, strip))
+
+  def show(self, buffer, block=True):
+    self.neopixel.setPixels(buffer)
+    for channel, strip in self.strips:
+      channel.setBrightness(strip.level)
+      channel.setPixels(strip.buffer)
+    self.neopixel.show(block)
+
+  def wait(self):
+    self.neopixel.wait()
+
+class Ws2812(Backend):
+  '''
+  Drive the LEDs with the legacy ws2812 SWIG module
+
+  ws2812 has no bulk write, so every pixel is set
+  individually before each show().
+  '''
+  gamma = WS281X_GAMMA
+
+  def __init__(self, count):
+    import ws2812
+    Backend.__init__(self, count)
+    self.ws2812 = ws2812
+
+  def begin(self):
+    self.ws2812.init(self.count)
+
+  def set_brightness(self, brightness):
+    Backend.set_brightness(self, brightness)
+    self.ws2812.setBrightness(brightness / 255.0)
+
+  def transfer(self, brightness):
+    return _ws2812_transfer(brightness)
+
+  def show(self, buffer, block=True):
+    for index in range(self.count):
+      r, g, b = buffer[index * 3:(index * 3) + 3]
+      self.ws2812.setPixelColor(index, r, g, b)
+    self.ws2812.show()
+
+  def cleanup(self):
+    self.ws2812.terminate(0)
+
+class Emulator(Backend):
+  '''
+  Send frames to the UnicornHat emulator over TCP
+
+  The emulator listens on the first free port from 7676
+  upwards, so ports are tried in turn up to 7676 + attempts.
+  order lists the LED index shown at each emulator position,
+  row by row, and brightness is applied before sending.
+
+  Frames go out in the emulator's binary protocol, a header
+  and the raw r, g, b bytes, unless protocol is 'text'.
+  '''
+  MAGIC = b'\xffU'
+  HEADER = struct.Struct('!2sBH')
+  CMD_FRAME = 0
+  CMD_STOP = 2
+
+  def __init__(self, count, order, host='127.0.0.1', port=7676, attempts=10, protocol='binary'):
+    if protocol not in ['binary', 'text']:
+      raise ValueError('Protocol must be binary or text')
+    Backend.__init__(self, count)
+    self.order = order
+    self.host = host
+    self.port = port
+    self.attempts = attempts
+    self.protocol = protocol
+    self.sck = None
+    self._scale = _scale_table(self.brightness)
+    self._reorder = operator.itemgetter(*[(index * 3) + channel for index in order for channel in range(3)])
+    self._header = self.HEADER.pack(self.MAGIC, self.CMD_FRAME, len(order) * 3)
+
+  def begin(self):
+    for port in range(self.port, self.port + self.attempts + 1):
+      try:
+        self.sck = socket.create_connection((self.host, port))
+        return
+      except socket.error:
+        pass
+    raise RuntimeError('Unable to connect to UnicornHat Emulator')
+
+  def set_brightness(self, brightness):
+    Backend.set_brightness(self, brightness)
+    self._scale = _scale_table(brightness)
+
+  def show(self, buffer, block=True):
+    frame = bytearray(self._reorder(bytearray(bytes(buffer).translate(self._scale))))
+    if self.protocol == 'binary':
+      self.sck.sendall(self._header + bytes(frame))
+    else:
+      pixels = ['{0:02x}{1:02x}{2:02x}'.format(*frame[index:index + 3]) for index in range(0, len(frame), 3)]
+      self.sck.sendall((','.join(pixels) + '\n').encode('ascii'))
+
+  def cleanup(self):
+    if self.sck is not None:
+      try:
+        if self.protocol == 'binary':
+          self.sck.sendall(self.HEADER.pack(self.MAGIC, self.CMD_STOP, 0))
+        else:
+          self.sck.sendall(b'stop\n')
+        self.sck.shutdown(socket.SHUT_RDWR)
+      except socket.error:
+        pass
+      self.sck.close()
+      self.sck = None
+
+class Unicornd(Backend):
+  '''
+  Send frames to the unicornd daemon over its Unix socket,
+  so scripts don't need to run as root
+
+  Each show() reorders the buffer into the daemon's set all
+  pixels layout and sends it, followed by show, in one write.
+  With extended True only the changes are sent, see
+  unicornd.Client. Brightness is applied by the daemon.
+  '''
+  gamma = WS281X_GAMMA
+
+  def __init__(self, count, path=None, extended=False):
+    from . import unicornd
+    if count != unicornd.PIXEL_COUNT:
+      raise ValueError('unicornd drives exactly {0} pixels'.format(unicornd.PIXEL_COUNT))
+    Backend.__init__(self, count)
+    self.client = unicornd.Client(path or unicornd.SOCKET_PATH, extended)
+    self._reorder = operator.itemgetter(*[(index * 3) + channel for index in unicornd.ORDER for channel in range(3)])
+
+  def begin(self):
+    self.client.connect()
+
+  def set_brightness(self, brightness):
+    Backend.set_brightness(self, brightness)
+    if self.client.sck is not None:
+      self.client.set_brightness(brightness / 255.0)
+
+  def transfer(self, brightness):
+    # The daemon drives the LEDs through the ws2812 library
+    return _ws2812_transfer(brightness)
+
+  def show(self, buffer, block=True):
+    self.client.show_frame(bytearray(self._reorder(buffer)))
+
+  def cleanup(self):
+    self.client.close()
+
+class Simulator(Backend):
+  '''
+  Keep frames in memory, modelling the time a real
+  WS2812 chain takes to receive them
+
+  Each LED takes 24 bits at freq_hz, followed by the
+  reset (latch) time, so a 64 LED frame takes about
+  2ms at 800KHz. Like the DMA driver show() returns once
+  a frame has started and a frame can't start until the
+  last one has finished.
+
+  leds holds the last frame shown as the LEDs would light
+  it, looked up in gamma, WS281X_GAMMA as rpi_ws281x does
+  unless given, None for none, then scaled by brightness.
+  frames counts the frames shown. strips lists the strips
+  added and strip_leds the last frame shown on each. Like the
+  two PWM channels, strips are sent out alongside the main
+  LEDs, so a frame takes as long as the longest of them.
+  '''
+  def __init__(self, count, freq_hz=800000, reset_time=0.00005, gamma=WS281X_GAMMA):
+    Backend.__init__(self, count)
+    self.gamma = gamma
+    self.freq_hz = freq_hz
+    self.reset_time = reset_time
+    self.frame_time = ((count * 24.0) / freq_hz) + reset_time
+    self.leds = bytearray(count * 3)
+    self.strips = []
+    self.strip_leds = []
+    self.frames = 0
+    self.busy_until = 0.0
+    self._scale = _scale_table(self.brightness, gamma)
+    self._strip_scales = {}
+
+  def add_strip(self, strip):
+    self.strips.append(strip)
+    self.strip_leds.append(bytearray(strip.count * 3))
+    longest = max([self.count] + [strip.count for strip in self.strips])
+    self.frame_time = ((longest * 24.0) / self.freq_hz) + self.reset_time
+
+  def set_brightness(self, brightness):
+    Backend.set_brightness(self, brightness)
+    self._scale = _scale_table(brightness, self.gamma)
+
+  def show(self, buffer, block=True):
+    self.wait()
+    self.leds[:] = bytes(buffer).translate(self._scale)
+    for strip, leds in zip(self.strips, self.strip_leds):
+      if strip.level not in self._strip_scales:
+        self._strip_scales[strip.level] = _scale_table(strip.level, self.gamma)
+      leds[:] = bytes(strip.buffer).translate(self._strip_scales[strip.level])
+    self.frames += 1
+    self.busy_until = _monotonic() + self.frame_time
+    if block:
+      self.wait()
+
+  def wait(self):
+    remaining = self.busy_until - _monotonic()
+    if remaining > 0:
+      time.sleep(remaining)
@@ -0,0 +1,134 @@
+'''
+Frame cache for periodic effects
+
+Many effects repeat every so many steps, a hue cycling on
+step % 255 for example, but still work out every pixel of
+every frame. FrameCache keeps rendered frames, r, g, b bytes
+in LED order, keyed by the effect, its parameters and the step
+modulo the period, so after the first cycle drawing a frame is
+a single copy into the display buffer.
+
+The cache is bounded to max_bytes of frames, the least
+recently used frames are evicted first.
+
+    from unicornhat import cache
+    unicornhat.run(cache.memoize(draw, period=255), fps=60)
+
+Only cache effects that draw every pixel from the step alone,
+an effect that builds on the last frame or uses random numbers
+would be frozen into its first cycle.
+'''
+import collections
+
+import unicornhat
+
+class FrameCache(object):
+  '''
+  A least recently used cache of frames, bounded to max_bytes
+
+  hits, misses and evictions count lookups that found a
+  frame, lookups that didn't and frames dropped to make room.
+  '''
+  def __init__(self, max_bytes=1 << 20):
+    self.max_bytes = max_bytes
+    self.size = 0
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self._frames = collections.OrderedDict()
+
+  def __len__(self):
+    return len(self._frames)
+
+  def __contains__(self, key):
+    return key in self._frames
+
+  def get(self, key):
+    '''
+    Get the frame stored under key, or None
+    '''
+    frame = self._frames.pop(key, None)
+    if frame is None:
+      self.misses += 1
+      return None
+    # Move it to the most recently used end
+    self._frames[key] = frame
+    self.hits += 1
+    return frame
+
+  def put(self, key, frame):
+    '''
+    Store a frame under key, evicting the least
+    recently used frames to stay within max_bytes
+    '''
+    frame = bytes(frame)
+    if len(frame) > self.max_bytes:
+      return
+    old = self._frames.pop(key, None)
+    if old is not None:
+      self.size -= len(old)
+    while self.size + len(frame) > self.max_bytes:
+      evicted_key, evicted = self._frames.popitem(last=False)
+      self.size -= len(evicted)
+      self.evictions += 1
+    self._frames[key] = frame
+    self.size += len(frame)
+
+  def clear(self):
+    '''
+    Drop every frame and reset the stats
+    '''
+    self._frames.clear()
+    self.size = self.hits = self.misses = self.evictions = 0
+
+  def get_stats(self):
+    '''
+    Get the cache hits, misses, evictions, frames, bytes
+    used and the hit rate from 0.0 to 1.0
+    '''
+    lookups = self.hits + self.misses
+    return {
+      'hits': self.hits,
+      'misses': self.misses,
+      'evictions': self.evictions,
+      'frames': len(self._frames),
+      'bytes': self.size,
+      'hit_rate': float(self.hits) / lookups if lookups else 0.0
+    }
+
+'''
+Shared by memoize() unless it's given a cache of its own
+'''
+default_cache = FrameCache()
+
+def memoize(draw, period, params=(), key=None, cache=None):
+  '''
+  Wrap draw(step), which draws a frame into the unicornhat
+  buffer, so each frame is drawn once per phase of period
+  and copied out of the cache after that
+
+  Frames are keyed by key, which defaults to draw, params, the
+  rotation, the layout and step % period. Pass the effect's parameters as
+  params so different settings are stored separately.
+  '''
+  if period <= 0:
+    raise ValueError('Period must be greater than 0')
+  if cache is None:
+    cache = default_cache
+  if key is None:
+    key = draw
+  params = tuple(params)
+
+  def cached(step):
+    frame_key = (key, params, unicornhat.get_rotation(), unicornhat.get_layout(), step % period)
+    frame = cache.get(frame_key)
+    if frame is None:
+      result = draw(step)
+      # False stops the loop, the buffer may not hold a frame
+      if result is not False:
+        cache.put(frame_key, unicornhat.get_leds())
+      return result
+    unicornhat.set_leds(frame)
+
+  cached.cache = cache
+  return cached
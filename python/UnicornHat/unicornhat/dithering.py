@@ -0,0 +1,94 @@
+'''
+Temporal dithering of high bit depth frames, needs NumPy
+
+UnicornHat shows whole levels of each channel, looked up in
+the driver's gamma table and scaled down by brightness, at 0.2
+only 52 of the 256 levels a byte can hold are left, so slow fades
+visibly step from one level to the next. Dither works out the
+exact level each channel should be at with the output's transfer
+curve, see backends.Backend.transfer(), rounds it to the nearest
+level the output can show and carries what was rounded off over
+to the same pixel in the next frame, so over a few frames every
+pixel averages out at its exact level.
+
+unicornhat dithers uint16 and float frames given to
+set_pixels() with a Dither when they're shown, see
+unicornhat.set_pixels().
+'''
+import numpy
+
+from .backends import Backend
+
+_BYTES = numpy.arange(256)
+
+def _levels(exact, shown):
+  '''
+  Get the exact level of each byte, the whole levels the output
+  can show, in order, and the smallest byte showing each, from
+  a transfer curve, see backends.Backend.transfer()
+  '''
+  levels, first = numpy.unique(numpy.array(shown), return_index=True)
+  return numpy.array(exact, dtype=float), levels.astype(float), first.astype(numpy.uint8)
+
+class Dither(object):
+  '''
+  Dither frames of count pixels for an output with the transfer
+  curve transfer(brightness), by default the plain brightness
+  scale of a Backend without gamma, error holds what each
+  channel's level was rounded off by in the last frame
+  '''
+  def __init__(self, count, transfer=None):
+    self.error = numpy.zeros(count * 3)
+    self.transfer = transfer or Backend(count).transfer
+    self._tables = {}
+    self._channels = None
+
+  def reset(self):
+    '''
+    Forget the rounding carried over from the last frame
+    '''
+    self.error[:] = 0
+
+  def correct(self, values, gamma=1.0, white_balance=(1.0, 1.0, 1.0), curves=None):
+    '''
+    Apply colour correction, see unicornhat.gamma(), white_balance()
+    and curve(), to r, g, b values from 0.0 to 255.0 without
+    rounding them to whole numbers first
+    '''
+    if curves is not None:
+      values = values.reshape(-1, 3).copy()
+      for channel in range(3):
+        values[:, channel] = numpy.interp(values[:, channel], numpy.arange(256), curves[channel])
+      values = values.reshape(-1)
+    if gamma != 1.0:
+      values = ((values / 255.0) ** gamma) * 255.0
+    if white_balance != (1.0, 1.0, 1.0):
+      if self._channels is None or self._channels[0] != white_balance:
+        self._channels = (white_balance, numpy.tile(numpy.array(white_balance), len(values) // 3))
+      values = values * self._channels[1]
+    return values
+
+  def frame(self, values, brightness=255):
+    '''
+    Dither r, g, b values from 0.0 to 255.0, returns the bytes
+    to send out that show the nearest levels at brightness
+    '''
+    if brightness not in self._tables:
+      self._tables[brightness] = _levels(*self.transfer(brightness))
+    exact, levels, bytes_for_level = self._tables[brightness]
+
+    if len(levels) == 1:
+      # Nothing to dither between, such as at brightness 0
+      self.error[:] = 0
+      return bytes(bytearray(bytes_for_level[:1]) * len(values))
+
+    target = numpy.interp(values, _BYTES, exact)
+    numpy.clip(target, levels[0], levels[-1], out=target)
+    target += self.error
+    # The levels either side of each target, the curve has
+    # gaps so the nearest isn't always a rounding away
+    upper = numpy.searchsorted(levels, target).clip(1, len(levels) - 1)
+    lower = upper - 1
+    nearest = numpy.where(target - levels[lower] < levels[upper] - target, lower, upper)
+    numpy.subtract(target, levels[nearest], out=self.error)
+    return bytes_for_level[nearest].tobytes()
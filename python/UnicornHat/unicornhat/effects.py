@@ -0,0 +1,210 @@
+'''
+Vectorised effects for unicornhat, needs NumPy
+
+An effect is a function of the x and y coordinate grids and
+the step number, returning r, g, b, each an array the shape
+of the grid or a single value, roughly 0.0 to 255.0. Every
+pixel of a frame is worked out by a handful of NumPy calls
+instead of calling a Python function once per pixel.
+
+Playlist runs a list of effects one after another, cross
+fading between them. Its frames are drawn as floats, which
+unicornhat.set_pixels() dithers, so fades stay smooth even
+at low brightness:
+
+    from unicornhat import effects
+    playlist = effects.Playlist([effects.swirl, effects.tunnel])
+    unicornhat.run(playlist.draw, fps=100)
+'''
+import colorsys, math
+
+import numpy
+
+import unicornhat
+
+def grid(width=8, height=8):
+  '''
+  Get the x and y coordinate of every pixel, as
+  two float arrays of shape (height, width)
+  '''
+  return numpy.meshgrid(numpy.arange(width, dtype=float), numpy.arange(height, dtype=float))
+
+def hsv_to_rgb(h, s, v):
+  '''
+  Vectorised colorsys.hsv_to_rgb, h, s and v can be
+  arrays or single values, returns r, g, b from 0.0 to 1.0
+  '''
+  h, s, v = numpy.broadcast_arrays(*[numpy.asarray(value, dtype=float) for value in (h, s, v)])
+  i = numpy.floor(h * 6.0)
+  f = (h * 6.0) - i
+  p = v * (1.0 - s)
+  q = v * (1.0 - (s * f))
+  t = v * (1.0 - (s * (1.0 - f)))
+  i = i.astype(int) % 6
+  r = numpy.choose(i, [v, q, p, p, t, v])
+  g = numpy.choose(i, [t, v, v, q, p, p])
+  b = numpy.choose(i, [p, p, t, v, v, q])
+  return r, g, b
+
+def render(effect, x, y, step):
+  '''
+  Evaluate an effect into a float array of shape (height, width, 3)
+  '''
+  return numpy.stack(numpy.broadcast_arrays(x, *effect(x, y, step))[1:], axis=-1).astype(float)
+
+def to_uint8(frame):
+  '''
+  Clip a float frame to 0-255 and convert it to uint8
+  '''
+  return numpy.clip(frame, 0, 255).astype(numpy.uint8)
+
+def crossfade(frame, next_frame, ratio):
+  '''
+  Mix two frames, ratio 1.0 is all frame and 0.0 all next_frame
+  '''
+  return (frame * ratio) + (next_frame * (1.0 - ratio))
+
+class Playlist(object):
+  '''
+  Play effects in turn, each for duration steps, cross
+  fading into the next one over the last fade steps
+
+  width and height default to the size of the display.
+  '''
+  def __init__(self, effects, duration=500, fade=100, width=None, height=None):
+    if fade > duration:
+      raise ValueError('Fade must not be longer than duration')
+    if width is None or height is None:
+      width, height = unicornhat.get_shape()
+    self.effects = effects
+    self.duration = duration
+    self.fade = fade
+    self.x, self.y = grid(width, height)
+
+  def render(self, step):
+    '''
+    Get frame step as a float array
+    '''
+    position = step % self.duration
+    number = step // self.duration
+    effect = self.effects[number % len(self.effects)]
+    frame = render(effect, self.x, self.y, step)
+    if position > self.duration - self.fade:
+      next_effect = self.effects[(number + 1) % len(self.effects)]
+      ratio = float(self.duration - position) / self.fade
+      frame = crossfade(frame, render(next_effect, self.x, self.y, step), ratio)
+    return frame
+
+  def frame(self, step):
+    '''
+    Get frame step as a uint8 array of shape (height, width, 3)
+    '''
+    return to_uint8(self.render(step))
+
+  def draw(self, step):
+    '''
+    Draw frame step into the unicornhat buffer, for unicornhat.run()
+    '''
+    unicornhat.set_pixels(self.render(step))
+
+# twisty swirly goodness
+def swirl(x, y, step):
+  x = x - 4
+  y = y - 4
+
+  dist = numpy.sqrt((x ** 2) + (y ** 2)) / 2.0
+  angle = (step / 10.0) + (dist * 1.5)
+  s = numpy.sin(angle)
+  c = numpy.cos(angle)
+
+  xs = (x * c) - (y * s)
+  ys = (x * s) + (y * c)
+
+  r = (numpy.abs(xs + ys) * 64.0) - 20
+
+  return r, r + (s * 130), r + (c * 130)
+
+# roto-zooming checker board
+def checker(x, y, step):
+  x = x - 4
+  y = y - 4
+
+  angle = step / 10.0
+  s = math.sin(angle)
+  c = math.cos(angle)
+
+  xs = (x * c) - (y * s)
+  ys = (x * s) + (y * c)
+
+  xs -= math.sin(step / 200.0) * 40.0
+  ys -= math.cos(step / 200.0) * 40.0
+
+  scale = (math.sin(step / 50.0) / 8.0) + 0.25
+
+  xs *= scale
+  ys *= scale
+
+  xo = numpy.abs(xs) % 1
+  yo = numpy.abs(ys) % 1
+  l = numpy.where((numpy.floor(xs) + numpy.floor(ys)) % 2, 0.0, numpy.where((xo > .1) & (yo > .1), 1.0, .5))
+
+  # Full saturation, so the colour is the hue at full value scaled by l
+  r, g, b = colorsys.hsv_to_rgb((step % 255) / 255.0, 1, 1)
+
+  return l * (r * 255), l * (g * 255), l * (b * 255)
+
+# weeee waaaah
+def blues_and_twos(x, y, step):
+  x = x - 4
+  y = y - 4
+
+  scale = math.sin(step / 6.0) / 1.5
+  r = numpy.sin(x * scale) + numpy.cos(y * scale)
+  b = numpy.sin(x * scale / 2.0) + numpy.cos(y * scale / 2.0)
+  g = numpy.maximum(r - .8, 0)
+
+  b = (b - r) / 1.4
+
+  return r * 255, (b + g) * 255, g * 255
+
+# rainbow search spotlights
+def rainbow_search(x, y, step):
+  xs = math.sin(step / 100.0) * 20.0
+  ys = math.cos(step / 100.0) * 20.0
+
+  scale = ((math.sin(step / 60.0) + 1.0) / 5.0) + 0.2
+  r = numpy.sin((x + xs) * scale) + numpy.cos((y + xs) * scale)
+  g = numpy.sin((x + xs) * scale) + numpy.cos((y + ys) * scale)
+  b = numpy.sin((x + ys) * scale) + numpy.cos((y + ys) * scale)
+
+  return r * 255, g * 255, b * 255
+
+# zoom tunnel
+def tunnel(x, y, step):
+  speed = step / 100.0
+
+  x = x - 4 + (math.sin(step / 27.0) * 2)
+  y = y - 4 + (math.cos(step / 18.0) * 2)
+
+  with numpy.errstate(divide='ignore', invalid='ignore'):
+    angle = numpy.where(y == 0, numpy.where(x < 0, -numpy.pi / 2, numpy.pi / 2), numpy.arctan(x / y))
+  angle = numpy.where(y > 0, angle + numpy.pi, angle)
+
+  # convert angle to 0...1 range
+  angle /= 2 * numpy.pi
+
+  distance = numpy.sqrt((x ** 2) + (y ** 2))
+  shade = numpy.minimum(distance / 2.1, 1)
+
+  angle += speed
+  depth = speed + (distance / 10)
+
+  hue = (step % 255) / 255.0
+  bright = numpy.array(colorsys.hsv_to_rgb(hue, 1, .8))
+  dark = numpy.array(colorsys.hsv_to_rgb(hue, 1, .3))
+
+  col = numpy.where((numpy.floor(numpy.abs(angle * 6.0)) % 2 == 0)[..., None], bright, dark)
+  col += numpy.where(numpy.floor(numpy.abs(depth * 3.0)) % 2 == 0, .3, 0)[..., None]
+  col *= shade[..., None] * 255
+
+  return col[..., 0], col[..., 1], col[..., 2]
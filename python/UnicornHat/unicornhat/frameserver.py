@@ -0,0 +1,229 @@
+'''
+Multi-client unicornd compatible frame server, needs Python 3.7+
+
+unicornd serves one client at a time, so a second program
+waits until the first disconnects. FrameServer speaks the same
+protocol (see unicornhat.unicornd) on the same socket path but
+accepts any number of clients at once.
+
+Every client draws into its own frame and publishes it with
+show. Published frames are layered by priority, higher on top,
+with black pixels letting the layers underneath show through,
+then composited and shown at no more than fps frames a second,
+so many clients showing at once cost a single update. Clients
+with the same priority are stacked in the order they connected.
+
+Clients set their priority with the set priority command,
+unicornd.Client.set_priority(), which only the frame server
+understands. Brightness is shared, the last client to set it wins.
+
+Run it in place of unicornd with:
+
+    sudo python3 -m unicornhat.frameserver
+'''
+import argparse, asyncio, itertools, os, struct, time
+
+from . import unicornd
+
+FRAME_SIZE = unicornd.FRAME_SIZE
+
+BLACK = bytes(FRAME_SIZE)
+
+def composite(frames):
+  '''
+  Layer frames, r, g, b bytes in LED order, bottom first,
+  black pixels in each frame are transparent
+  '''
+  output = bytearray(FRAME_SIZE)
+  for frame in frames:
+    for index in range(0, FRAME_SIZE, 3):
+      if frame[index] or frame[index + 1] or frame[index + 2]:
+        output[index:index + 3] = frame[index:index + 3]
+  return output
+
+class Layer(object):
+  '''
+  A connected client, leds is the frame it is drawing and
+  frame the last one it showed. sequence is the last frame
+  number it sent with show sequence and missed counts the
+  gaps in the numbering.
+  '''
+  def __init__(self, order, writer):
+    self.order = order
+    self.writer = writer
+    self.task = asyncio.current_task()
+    self.priority = 0
+    self.leds = bytearray(FRAME_SIZE)
+    self.frame = BLACK
+    self.shows = 0
+    self.sequence = None
+    self.missed = 0
+
+class FrameServer(object):
+  '''
+  Serve unicornd clients and composite their frames
+
+  on_show is called with the composited frame, r, g, b
+  bytes in LED order, and the brightness between 0.0 and
+  1.0, at most fps times a second and only when a client
+  has shown something new. shows counts the shows received,
+  frames the frames output and render_time the total time
+  spent compositing and in on_show.
+  '''
+  def __init__(self, on_show, path=unicornd.SOCKET_PATH, fps=60):
+    self.on_show = on_show
+    self.path = path
+    self.fps = fps
+    self.brightness = unicornd.DEFAULT_BRIGHTNESS
+    self.layers = []
+    self.shows = 0
+    self.frames = 0
+    self.render_time = 0.0
+    self.server = None
+    self._order = itertools.count()
+    self._dirty = None
+    self._render = None
+
+  async def start(self):
+    if os.path.exists(self.path):
+      os.unlink(self.path)
+    self._dirty = asyncio.Event()
+    self.server = await asyncio.start_unix_server(self.handle, path=self.path)
+    self._render = asyncio.ensure_future(self.render())
+
+  async def stop(self):
+    self.server.close()
+    # Disconnect the clients and let them finish with what
+    # they have already sent
+    layers = list(self.layers)
+    for layer in layers:
+      layer.writer.close()
+    await asyncio.gather(*[layer.task for layer in layers])
+    await self.server.wait_closed()
+    self._render.cancel()
+    try:
+      await self._render
+    except asyncio.CancelledError:
+      pass
+    if os.path.exists(self.path):
+      os.unlink(self.path)
+
+  async def serve_forever(self):
+    await self.start()
+    try:
+      while True:
+        await asyncio.sleep(3600)
+    finally:
+      await self.stop()
+
+  async def render(self):
+    # Show the composited layers whenever a client has shown
+    # a new frame, but no more than fps times a second
+    period = 1.0 / self.fps
+    while True:
+      await self._dirty.wait()
+      self._dirty.clear()
+      start = time.monotonic()
+      layers = sorted(self.layers, key=lambda layer: (layer.priority, layer.order))
+      self.on_show(composite([layer.frame for layer in layers]), self.brightness)
+      self.frames += 1
+      self.render_time += time.monotonic() - start
+      remaining = period - (time.monotonic() - start)
+      if remaining > 0:
+        await asyncio.sleep(remaining)
+
+  async def handle(self, reader, writer):
+    layer = Layer(next(self._order), writer)
+    self.layers.append(layer)
+    try:
+      await self.read_commands(reader, layer)
+    except (asyncio.IncompleteReadError, ConnectionError):
+      pass
+    finally:
+      self.layers.remove(layer)
+      self._dirty.set()
+      writer.close()
+
+  async def read_commands(self, reader, layer):
+    # Run the commands from one client until it disconnects
+    # or sends something unknown, as unicornd does
+    while True:
+      code = (await reader.readexactly(1))[0]
+
+      if code == unicornd.CMD_SET_BRIGHTNESS:
+        brightness = struct.unpack('=d', await reader.readexactly(unicornd.SET_BRIGHTNESS.size - 1))[0]
+        if 0.0 <= brightness <= 1.0:
+          self.brightness = brightness
+          self._dirty.set()
+
+      elif code == unicornd.CMD_SET_PIXEL:
+        x, y, r, g, b = await reader.readexactly(unicornd.SET_PIXEL.size - 1)
+        if x < 8 and y < 8:
+          index = unicornd.pixel_index(x, y) * 3
+          layer.leds[index:index + 3] = bytes((r, g, b))
+
+      elif code == unicornd.CMD_SET_ALL_PIXELS:
+        layer.leds[:] = unicornd.to_leds(await reader.readexactly(FRAME_SIZE))
+
+      elif code == unicornd.CMD_SHOW or code == unicornd.CMD_SHOW_SEQUENCE:
+        if code == unicornd.CMD_SHOW_SEQUENCE:
+          sequence = struct.unpack('=I', await reader.readexactly(unicornd.SHOW_SEQUENCE.size - 1))[0]
+          if layer.sequence is not None:
+            layer.missed += (sequence - layer.sequence - 1) & 0xffffffff
+          layer.sequence = sequence
+        layer.frame = bytes(layer.leds)
+        layer.shows += 1
+        self.shows += 1
+        self._dirty.set()
+        # readexactly() doesn't give way while data is buffered,
+        # so a busy client could otherwise starve the render loop
+        await asyncio.sleep(0)
+
+      elif code == unicornd.CMD_SET_PRIORITY:
+        layer.priority = struct.unpack('=b', await reader.readexactly(unicornd.SET_PRIORITY.size - 1))[0]
+        self._dirty.set()
+
+      elif code == unicornd.CMD_SET_PIXELS:
+        count = (await reader.readexactly(1))[0]
+        if count > unicornd.PIXEL_COUNT:
+          return
+        unicornd.set_positions(layer.leds, await reader.readexactly(count * 4))
+
+      elif code == unicornd.CMD_SET_ALL_PIXELS_RLE:
+        count = (await reader.readexactly(1))[0]
+        if count > unicornd.PIXEL_COUNT:
+          return
+        if not unicornd.set_runs(layer.leds, await reader.readexactly(count * 4)):
+          return
+
+      else:
+        return
+
+def main():
+  parser = argparse.ArgumentParser(description='Multi-client unicornd compatible frame server')
+  parser.add_argument('--socket', default=unicornd.SOCKET_PATH, help='path of the Unix socket to listen on')
+  parser.add_argument('--backend', default=None, help='unicornhat backend to show frames on, see unicornhat.set_backend')
+  parser.add_argument('--fps', type=int, default=60, help='most frames to show each second')
+  args = parser.parse_args()
+
+  import unicornhat
+  if args.backend is not None:
+    unicornhat.set_backend(args.backend)
+  backend = unicornhat.begin()
+  shown = [None]
+
+  def on_show(frame, brightness):
+    level = int(brightness * 255)
+    if level != shown[0]:
+      backend.set_brightness(level)
+      shown[0] = level
+    backend.show(frame, False)
+
+  server = FrameServer(on_show, args.socket, args.fps)
+  try:
+    asyncio.run(server.serve_forever())
+  except KeyboardInterrupt:
+    pass
+
+if __name__ == '__main__':
+  main()
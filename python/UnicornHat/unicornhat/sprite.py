@@ -0,0 +1,297 @@
+'''
+Sprite sheet animations for unicornhat
+
+A sprite sheet is a PNG strip 8 pixels wide with one 8x8
+frame under another, like the animations in c/unicorn/anim,
+or as wide as the display with frames its size, see
+unicornhat.layout().
+The first time a sheet is played it is decoded and every frame
+is translated into LED order for the chosen rotation and saved
+in a cache file. After that the cache is memory mapped and each
+frame is copied straight into the display buffer, so playback
+starts instantly and costs almost nothing per frame.
+
+The cache is rebuilt whenever the PNG's modification time or
+size changes, and each rotation and layout has its own cache
+file.
+
+PNGs are decoded without any extra libraries if they are 8 bits
+per channel and not interlaced, Pillow is used for anything else.
+'''
+import hashlib, mmap, os, struct, zlib
+
+import unicornhat
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+'''
+Channels per pixel for each PNG colour type
+'''
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+'''
+Cache file header, the magic, source modification time in
+nanoseconds and size, rotation and number of frames
+'''
+CACHE_MAGIC = b'UHSC'
+CACHE_HEADER = struct.Struct('!4sqqHI')
+
+class UnsupportedPNG(ValueError):
+  '''
+  A PNG that can't be decoded without Pillow, read_png()
+  falls back to Pillow when this is raised
+  '''
+  pass
+
+def _paeth(a, b, c):
+  p = a + b - c
+  pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+  if pa <= pb and pa <= pc:
+    return a
+  if pb <= pc:
+    return b
+  return c
+
+def _unfilter(row, previous, method, step):
+  '''
+  Undo the PNG filter on a scanline in place
+  '''
+  if method == 1:
+    for i in range(step, len(row)):
+      row[i] = (row[i] + row[i - step]) & 0xff
+  elif method == 2:
+    for i in range(len(row)):
+      row[i] = (row[i] + previous[i]) & 0xff
+  elif method == 3:
+    for i in range(len(row)):
+      left = row[i - step] if i >= step else 0
+      row[i] = (row[i] + ((left + previous[i]) >> 1)) & 0xff
+  elif method == 4:
+    for i in range(len(row)):
+      left = row[i - step] if i >= step else 0
+      upper_left = previous[i - step] if i >= step else 0
+      row[i] = (row[i] + _paeth(left, previous[i], upper_left)) & 0xff
+  elif method != 0:
+    raise ValueError('Unknown PNG filter {0}'.format(method))
+
+def _decode_png(data):
+  '''
+  Decode an 8 bit, non-interlaced PNG into its width, height
+  and r, g, b bytes row by row, transparency is ignored
+  '''
+  if data[:8] != PNG_SIGNATURE:
+    raise ValueError('Not a PNG file')
+
+  offset = 8
+  header = None
+  palette = None
+  compressed = []
+  while offset < len(data):
+    length, kind = struct.unpack('!I4s', data[offset:offset + 8])
+    body = data[offset + 8:offset + 8 + length]
+    offset += length + 12
+    if kind == b'IHDR':
+      header = struct.unpack('!IIBBBBB', body)
+    elif kind == b'PLTE':
+      palette = bytearray(body)
+    elif kind == b'IDAT':
+      compressed.append(body)
+    elif kind == b'IEND':
+      break
+
+  width, height, depth, colour, compression, filter_method, interlace = header
+  if depth != 8 or interlace or colour not in PNG_CHANNELS:
+    raise UnsupportedPNG('Only 8 bit, non-interlaced PNGs can be decoded without Pillow')
+
+  step = PNG_CHANNELS[colour]
+  stride = width * step
+  raw = bytearray(zlib.decompress(b''.join(compressed)))
+  previous = bytearray(stride)
+  pixels = bytearray()
+  for y in range(height):
+    start = y * (stride + 1)
+    row = raw[start + 1:start + 1 + stride]
+    _unfilter(row, previous, raw[start], step)
+    previous = row
+    if colour == 2:
+      pixels += row
+    elif colour == 6:
+      rgb = row[:]
+      del rgb[3::4]
+      pixels += rgb
+    elif colour == 3:
+      for index in row:
+        pixels += palette[index * 3:(index * 3) + 3]
+    else:
+      for grey in row[::step]:
+        pixels += bytearray((grey, grey, grey))
+  return width, height, pixels
+
+def read_png(path):
+  '''
+  Read a PNG, returning its width, height and
+  r, g, b bytes row by row
+  '''
+  with open(path, 'rb') as png:
+    data = png.read()
+  try:
+    return _decode_png(data)
+  except UnsupportedPNG:
+    try:
+      from PIL import Image
+    except ImportError:
+      raise ImportError('{0} needs Pillow to decode, install with: pip install Pillow'.format(path))
+    image = Image.open(path).convert('RGB')
+    return image.size[0], image.size[1], bytearray(image.tobytes())
+
+def compile_frames(path, rotation=0):
+  '''
+  Read a sprite sheet and translate every frame into
+  r, g, b bytes in LED order for rotation
+  '''
+  index, frame_width, frame_height = unicornhat._get_index_table(rotation)
+  frame_size = len(index) * 3
+  width, height, pixels = read_png(path)
+  if width != frame_width or height % frame_height != 0 or height == 0:
+    raise ValueError('{0} must be {1} pixels wide, with {1}x{2} frames one under another'.format(path, frame_width, frame_height))
+
+  # Byte offset in the sheet of each LED channel, in LED order
+  offsets = [0] * frame_size
+  for position, led in enumerate(index):
+    offsets[led * 3:(led * 3) + 3] = [(position * 3) + channel for channel in range(3)]
+
+  frames = bytearray()
+  for start in range(0, len(pixels), frame_size):
+    frames += bytearray([pixels[start + offset] for offset in offsets])
+  return frames
+
+def default_cache_dir():
+  '''
+  Get the directory caches are kept in, under XDG_CACHE_HOME,
+  or ~/.cache, unless UNICORNHAT_CACHE is set
+  '''
+  if 'UNICORNHAT_CACHE' in os.environ:
+    return os.environ['UNICORNHAT_CACHE']
+  base = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+  return os.path.join(base, 'unicornhat')
+
+def cache_path(path, rotation=0, cache_dir=None):
+  '''
+  Get the cache file for a sprite sheet and rotation
+  with the current layout
+  '''
+  path = os.path.abspath(path)
+  digest = hashlib.sha1((path + repr(unicornhat.get_layout())).encode('utf-8')).hexdigest()[:12]
+  name = '{0}-{1}-{2}.frames'.format(os.path.splitext(os.path.basename(path))[0], digest, rotation)
+  return os.path.join(cache_dir or default_cache_dir(), name)
+
+def _source_key(path):
+  stat = os.stat(path)
+  return int(stat.st_mtime * 1e9), stat.st_size
+
+def build_cache(path, rotation=0, cache_dir=None):
+  '''
+  Compile a sprite sheet into its cache file, returns the cache path
+  '''
+  cache = cache_path(path, rotation, cache_dir)
+  mtime, size = _source_key(path)
+  frames = compile_frames(path, rotation)
+  directory = os.path.dirname(cache)
+  if not os.path.isdir(directory):
+    os.makedirs(directory)
+  # Write to a temporary file and move it into place, so a
+  # half written cache is never played
+  temporary = '{0}.{1}.tmp'.format(cache, os.getpid())
+  with open(temporary, 'wb') as output:
+    output.write(CACHE_HEADER.pack(CACHE_MAGIC, mtime, size, rotation, len(frames) // (unicornhat.LED_COUNT * 3)))
+    output.write(frames)
+  os.rename(temporary, cache)
+  return cache
+
+class Sprite(object):
+  '''
+  A sprite sheet animation, loaded from its cache
+
+  rotation defaults to the current unicornhat rotation.
+  Frames are read from the memory mapped cache, which is
+  built or rebuilt first if needed.
+  '''
+  def __init__(self, path, rotation=None, cache_dir=None):
+    if rotation is None:
+      rotation = unicornhat.get_rotation()
+    self.path = path
+    self.rotation = rotation
+    self.frame_size = unicornhat.LED_COUNT * 3
+    self.cache = cache_path(path, rotation, cache_dir)
+    self._file = None
+    self._map = None
+    if not self._open():
+      build_cache(path, rotation, cache_dir)
+      if not self._open():
+        raise IOError('Unable to load the cache for {0}'.format(path))
+
+  def _open(self):
+    # Map the cache, returns False if it is missing or stale
+    try:
+      cache = open(self.cache, 'rb')
+    except IOError:
+      return False
+    header = cache.read(CACHE_HEADER.size)
+    if len(header) == CACHE_HEADER.size:
+      magic, mtime, size, rotation, frames = CACHE_HEADER.unpack(header)
+      if magic == CACHE_MAGIC and (mtime, size) == _source_key(self.path) and rotation == self.rotation \
+          and os.fstat(cache.fileno()).st_size == CACHE_HEADER.size + (frames * self.frame_size):
+        self._file = cache
+        self._map = mmap.mmap(cache.fileno(), 0, access=mmap.ACCESS_READ)
+        self.frames = frames
+        return True
+    cache.close()
+    return False
+
+  def __len__(self):
+    return self.frames
+
+  def frame(self, number):
+    '''
+    Get a frame as r, g, b bytes in LED order
+    '''
+    start = CACHE_HEADER.size + ((number % self.frames) * self.frame_size)
+    return self._map[start:start + self.frame_size]
+
+  def show(self, number):
+    '''
+    Copy a frame into the display buffer and show it
+    '''
+    unicornhat.set_leds(self.frame(number))
+    unicornhat.show()
+
+  def play(self, fps=20, loops=1):
+    '''
+    Play the animation at fps, loops times, or forever if
+    loops is None, returns the unicornhat.FrameLoop used
+    '''
+    def draw(step):
+      if loops is not None and step >= self.frames * loops:
+        return False
+      unicornhat.set_leds(self.frame(step))
+
+    loop = unicornhat.FrameLoop(draw, fps)
+    loop.run()
+    return loop
+
+  def close(self):
+    if self._map is not None:
+      self._map.close()
+      self._file.close()
+      self._map = None
+      self._file = None
+
+def play(path, fps=20, loops=1, rotation=None, cache_dir=None):
+  '''
+  Play a sprite sheet animation, see Sprite.play()
+  '''
+  sprite = Sprite(path, rotation, cache_dir)
+  try:
+    return sprite.play(fps, loops)
+  finally:
+    sprite.close()
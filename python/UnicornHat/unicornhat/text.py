@@ -0,0 +1,296 @@
+'''
+Bitmap font text and scrolling for unicornhat
+
+A Font holds each glyph as packed column bitmaps, one int per
+column with bit 0 the top row, decoded once from a glyph sheet
+or the built in 3x5 font. Text is rendered into a strip of
+columns, r, g, b bytes top to bottom for each column, so the
+part on the display is a single slice of the strip and scrolling
+moves the slice rather than drawing the glyphs again.
+
+    from unicornhat import text
+    text.scroll('Hello World!', speed=30)
+
+Marquee keeps the strip for a piece of text, for drawing it
+yourself or running it with unicornhat.run():
+
+    marquee = text.Marquee('Hello World!', color=(255, 0, 0))
+    unicornhat.run(marquee.draw, fps=marquee.fps)
+'''
+import math
+import operator
+
+import unicornhat
+from . import sprite
+
+'''
+The built in font, 5 pixels high, '#' is a lit pixel and
+rows are separated by '|'. Lower case letters use the
+upper case glyphs.
+'''
+FONT_3X5 = {
+  ' ': '..|..|..|..|..',
+  '!': '#|#|#|.|#',
+  '"': '#.#|#.#|...|...|...',
+  '#': '#.#|###|#.#|###|#.#',
+  '$': '.##|##.|.#.|.##|##.',
+  '%': '#.#|..#|.#.|#..|#.#',
+  '&': '.#.|#.#|.#.|#.#|.##',
+  "'": '#|#|.|.|.',
+  '(': '.#|#.|#.|#.|.#',
+  ')': '#.|.#|.#|.#|#.',
+  '*': '#.#|.#.|#.#|...|...',
+  '+': '...|.#.|###|.#.|...',
+  ',': '..|..|..|.#|#.',
+  '-': '...|...|###|...|...',
+  '.': '.|.|.|.|#',
+  '/': '..#|..#|.#.|#..|#..',
+  '0': '###|#.#|#.#|#.#|###',
+  '1': '.#.|##.|.#.|.#.|###',
+  '2': '###|..#|###|#..|###',
+  '3': '###|..#|.##|..#|###',
+  '4': '#.#|#.#|###|..#|..#',
+  '5': '###|#..|###|..#|###',
+  '6': '###|#..|###|#.#|###',
+  '7': '###|..#|.#.|.#.|.#.',
+  '8': '###|#.#|###|#.#|###',
+  '9': '###|#.#|###|..#|###',
+  ':': '.|#|.|#|.',
+  ';': '..|.#|..|.#|#.',
+  '<': '..#|.#.|#..|.#.|..#',
+  '=': '...|###|...|###|...',
+  '>': '#..|.#.|..#|.#.|#..',
+  '?': '###|..#|.#.|...|.#.',
+  '@': '###|#.#|#.#|#..|.##',
+  'A': '.#.|#.#|###|#.#|#.#',
+  'B': '##.|#.#|##.|#.#|##.',
+  'C': '.##|#..|#..|#..|.##',
+  'D': '##.|#.#|#.#|#.#|##.',
+  'E': '###|#..|##.|#..|###',
+  'F': '###|#..|##.|#..|#..',
+  'G': '.##|#..|#.#|#.#|.##',
+  'H': '#.#|#.#|###|#.#|#.#',
+  'I': '###|.#.|.#.|.#.|###',
+  'J': '..#|..#|..#|#.#|.#.',
+  'K': '#.#|#.#|##.|#.#|#.#',
+  'L': '#..|#..|#..|#..|###',
+  'M': '#...#|##.##|#.#.#|#...#|#...#',
+  'N': '#..#|##.#|#.##|#..#|#..#',
+  'O': '.#.|#.#|#.#|#.#|.#.',
+  'P': '##.|#.#|##.|#..|#..',
+  'Q': '.#.|#.#|#.#|##.|.##',
+  'R': '##.|#.#|##.|#.#|#.#',
+  'S': '.##|#..|.#.|..#|##.',
+  'T': '###|.#.|.#.|.#.|.#.',
+  'U': '#.#|#.#|#.#|#.#|###',
+  'V': '#.#|#.#|#.#|#.#|.#.',
+  'W': '#...#|#...#|#.#.#|##.##|#...#',
+  'X': '#.#|#.#|.#.|#.#|#.#',
+  'Y': '#.#|#.#|.#.|.#.|.#.',
+  'Z': '###|..#|.#.|#..|###',
+  '[': '##|#.|#.|#.|##',
+  '\\': '#..|#..|.#.|..#|..#',
+  ']': '##|.#|.#|.#|##',
+  '^': '.#.|#.#|...|...|...',
+  '_': '...|...|...|...|###',
+  '`': '#.|.#|..|..|..',
+  '{': '.##|.#.|##.|.#.|.##',
+  '|': '#|#|#|#|#',
+  '}': '##.|.#.|.##|.#.|##.',
+  '~': '...|.##|##.|...|...'
+}
+
+class Font(object):
+  '''
+  A bitmap font, glyphs maps each character to a tuple of
+  column bitmaps, bit 0 the top row, height is the number
+  of rows and spacing the blank columns between characters.
+  Characters without a glyph are drawn as default.
+  '''
+  def __init__(self, glyphs, height, spacing=1, default='?'):
+    self.glyphs = glyphs
+    self.height = height
+    self.spacing = spacing
+    self.default = default
+
+  def glyph(self, char):
+    '''
+    Get the column bitmaps for a character
+    '''
+    if char in self.glyphs:
+      return self.glyphs[char]
+    if char.upper() in self.glyphs:
+      return self.glyphs[char.upper()]
+    return self.glyphs.get(self.default, ())
+
+  def columns(self, text):
+    '''
+    Get the column bitmaps for a string
+    '''
+    columns = []
+    gap = (0,) * self.spacing
+    for index, char in enumerate(text):
+      if index:
+        columns.extend(gap)
+      columns.extend(self.glyph(char))
+    return columns
+
+  def width(self, text):
+    '''
+    Get the width of a string in columns
+    '''
+    return len(self.columns(text))
+
+def _pack(rows):
+  # Turn rows of '#' and '.' into column bitmaps
+  return tuple(sum(1 << y for y, row in enumerate(rows) if row[x] == '#') for x in range(len(rows[0])))
+
+def load_font(path, chars, width=8, height=8, spacing=1, proportional=True):
+  '''
+  Load a font from a glyph sheet PNG of width x height cells,
+  left to right then top to bottom, one for each character in
+  chars. Any pixel that isn't black is lit.
+
+  With proportional set, blank columns either side of each
+  glyph are dropped and blank glyphs are half width.
+  '''
+  sheet_width, sheet_height, pixels = sprite.read_png(path)
+  across = sheet_width // width
+  if across * (sheet_height // height) < len(chars):
+    raise ValueError('{0} has fewer than {1} glyphs'.format(path, len(chars)))
+
+  glyphs = {}
+  for number, char in enumerate(chars):
+    left = (number % across) * width
+    top = (number // across) * height
+    columns = []
+    for x in range(left, left + width):
+      bits = 0
+      for y in range(height):
+        offset = (((top + y) * sheet_width) + x) * 3
+        if pixels[offset] or pixels[offset + 1] or pixels[offset + 2]:
+          bits |= 1 << y
+      columns.append(bits)
+    if proportional:
+      lit = [x for x, bits in enumerate(columns) if bits]
+      columns = columns[lit[0]:lit[-1] + 1] if lit else [0] * max(1, width // 2)
+    glyphs[char] = tuple(columns)
+  return Font(glyphs, height, spacing)
+
+'''
+The built in font, decoded once when the module is loaded
+'''
+DEFAULT_FONT = Font(dict((char, _pack(rows.split('|'))) for char, rows in FONT_3X5.items()), 5)
+
+def render(text, font=None, color=(255, 255, 255), background=(0, 0, 0), height=None, y=None):
+  '''
+  Render a string into a strip of columns, returns the number
+  of columns and a bytearray of r, g, b bytes for height pixels
+  down each column in turn.
+
+  height defaults to the display height and y, the row the
+  top of the text is drawn on, to centring the font in it.
+  '''
+  if font is None:
+    font = DEFAULT_FONT
+  if height is None:
+    height = unicornhat.get_shape()[1]
+  if y is None:
+    y = (height - font.height) // 2
+
+  lit = bytearray(color)
+  unlit = bytearray(background)
+  # Each distinct column bitmap is only turned into bytes once
+  cache = {}
+  strip = bytearray()
+  columns = font.columns(text)
+  for bits in columns:
+    if bits not in cache:
+      cache[bits] = b''.join(lit if 0 <= row - y < font.height and (bits >> (row - y)) & 1 else unlit for row in range(height))
+    strip += cache[bits]
+  return len(columns), strip
+
+'''
+Functions picking a window of a strip out in LED order,
+one per rotation and layout
+'''
+_window_tables = {}
+
+def _get_window():
+  width, height = unicornhat.get_shape()
+  key = (unicornhat.get_rotation(), unicornhat.get_layout())
+  if key not in _window_tables:
+    sources = [0] * (width * height * 3)
+    for x in range(width):
+      for y in range(height):
+        index = unicornhat.get_index_from_xy(x, y) * 3
+        sources[index:index + 3] = [(((x * height) + y) * 3) + channel for channel in range(3)]
+    _window_tables[key] = operator.itemgetter(*sources)
+  return _window_tables[key]
+
+class Marquee(object):
+  '''
+  Text scrolling right to left across the display at speed
+  columns a second, drawn at fps frames a second
+
+  The text starts off the right hand edge and scrolls until
+  it has gone off the left, then starts again. See render()
+  for font, color, background and y.
+  '''
+  def __init__(self, text, font=None, color=(255, 255, 255), background=(0, 0, 0), speed=30, fps=60, y=None):
+    if speed <= 0 or fps <= 0:
+      raise ValueError('Speed and fps must be greater than 0')
+    self.width, self.height = unicornhat.get_shape()
+    self.speed = speed
+    self.fps = fps
+    columns, strip = render(text, font, color, background, self.height, y)
+    # A display's width of background either side, so the
+    # text scrolls in and out rather than starting on screen
+    padding = bytearray(background) * (self.width * self.height)
+    self.strip = padding + strip + padding
+    self.columns = columns + (self.width * 2)
+    # Positions in one pass, from the text off the right edge
+    # until it has just gone off the left
+    self.length = self.columns - self.width
+
+  def __len__(self):
+    '''
+    Get the number of frames one pass takes at fps
+    '''
+    return int(math.ceil(self.length * self.fps / float(self.speed)))
+
+  def frame(self, position):
+    '''
+    Get the display at column position of the strip as
+    r, g, b bytes in LED order
+    '''
+    start = (int(position) % self.length) * self.height * 3
+    return bytearray(_get_window()(memoryview(self.strip)[start:start + (self.width * self.height * 3)]))
+
+  def draw(self, step):
+    '''
+    Draw frame step into the unicornhat buffer, for unicornhat.run()
+    '''
+    unicornhat.set_leds(self.frame(int((step * self.speed) // self.fps)))
+
+  def play(self, loops=1):
+    '''
+    Scroll the text across loops times, or forever if loops
+    is None, returns the unicornhat.FrameLoop used
+    '''
+    frames = len(self)
+
+    def draw(step):
+      if loops is not None and step >= frames * loops:
+        return False
+      self.draw(step)
+
+    loop = unicornhat.FrameLoop(draw, self.fps)
+    loop.run()
+    return loop
+
+def scroll(text, speed=30, loops=1, font=None, color=(255, 255, 255), background=(0, 0, 0), fps=60):
+  '''
+  Scroll text across the display, see Marquee
+  '''
+  return Marquee(text, font, color, background, speed, fps).play(loops)
@@ -0,0 +1,414 @@
+'''
+Client and reference server for the unicornd protocol
+
+unicornd (see c/unicornd) runs as root, drives UnicornHat and
+listens on a Unix socket, so programs talking to it don't need
+root. Each command is a one byte code followed by its arguments:
+
+0 set brightness - a native double between 0.0 and 1.0
+1 set pixel - x, y, r, g, b bytes
+2 set all pixels - r, g, b bytes for all 64 pixels, x major,
+  so pixel x, y is at (x * 8) + y
+3 show
+
+Extended commands, understood by this version of unicornd, the
+Python Server and the multi-client frame server:
+
+4 set priority - a signed byte, higher priorities are drawn on top
+  by the frame server, ignored by the others
+5 set pixels - a count, at most 64, followed by position, r, g, b
+  bytes for each pixel that changed, positions as in set all pixels
+6 set all pixels rle - a count, at most 64, followed by length,
+  r, g, b bytes for each run of pixels the same colour, covering
+  all 64 pixels
+7 show sequence - show, with a native unsigned 32 bit frame number
+
+Use the client through unicornhat with set_backend('unicornd'),
+or directly with Client. Server is a Python stand-in for the
+daemon, for tests and benchmarks on machines without a Pi.
+'''
+import operator, os, socket, struct, threading
+
+from . import map as _map
+
+SOCKET_PATH = '/var/run/unicornd.socket'
+
+CMD_SET_BRIGHTNESS = 0
+CMD_SET_PIXEL      = 1
+CMD_SET_ALL_PIXELS = 2
+CMD_SHOW           = 3
+CMD_SET_PRIORITY   = 4
+CMD_SET_PIXELS     = 5
+CMD_SET_ALL_PIXELS_RLE = 6
+CMD_SHOW_SEQUENCE  = 7
+
+PIXEL_COUNT = 64
+
+DEFAULT_BRIGHTNESS = 0.2
+
+SET_BRIGHTNESS = struct.Struct('=Bd')
+SET_PIXEL      = struct.Struct('=BBBBBB')
+SET_PRIORITY   = struct.Struct('=Bb')
+SHOW_SEQUENCE  = struct.Struct('=BI')
+
+FRAME_SIZE = PIXEL_COUNT * 3
+
+_OFFSETS = range(0, FRAME_SIZE, 3)
+
+'''
+The LED index unicornd sets for every position of a set
+all pixels command, pixel x, y goes to map[x][y]
+'''
+ORDER = [_map[x][y] for x in range(8) for y in range(8)]
+
+_to_leds = operator.itemgetter(*[(ORDER.index(index) * 3) + channel for index in range(PIXEL_COUNT) for channel in range(3)])
+
+def pixel_index(x, y):
+  '''
+  Get the LED index unicornd sets for pixel x, y
+  '''
+  return _map[x][y]
+
+def to_leds(pixels):
+  '''
+  Reorder a set all pixels payload into r, g, b bytes in LED order
+  '''
+  return bytearray(_to_leds(bytearray(pixels)))
+
+def set_positions(leds, data):
+  '''
+  Apply a set pixels payload, position, r, g, b bytes
+  for each pixel, to leds in LED order
+  '''
+  for offset in range(0, len(data), 4):
+    if data[offset] < PIXEL_COUNT:
+      index = ORDER[data[offset]] * 3
+      leds[index:index + 3] = data[offset + 1:offset + 4]
+
+def set_runs(leds, data):
+  '''
+  Apply a set all pixels rle payload, length, r, g, b
+  bytes for each run, to leds in LED order
+
+  Returns False, leaving leds alone, unless the runs
+  cover exactly 64 pixels
+  '''
+  if sum(data[0::4]) != PIXEL_COUNT:
+    return False
+  position = 0
+  for offset in range(0, len(data), 4):
+    colour = data[offset + 1:offset + 4]
+    for index in ORDER[position:position + data[offset]]:
+      leds[index * 3:(index * 3) + 3] = colour
+    position += data[offset]
+  return True
+
+def encode_frame(frame, last=None):
+  '''
+  Encode a frame, r, g, b bytes in set all pixels order,
+  with whichever command is smallest: set all pixels, set all
+  pixels rle or, if the last frame sent is given, set pixels
+  with just the pixels that changed.
+
+  Returns the name of the encoding, one of full, rle, sparse
+  or none if nothing changed, and the encoded command.
+  '''
+  frame = bytes(frame)
+  if last is not None and bytes(last) == frame:
+    return 'none', bytearray()
+
+  pixels = [frame[offset:offset + 3] for offset in _OFFSETS]
+  name = 'full'
+  size = FRAME_SIZE + 1
+
+  if last is not None:
+    last = bytes(last)
+    changed = [position for position, offset in enumerate(_OFFSETS) if last[offset:offset + 3] != pixels[position]]
+    if 2 + (len(changed) * 4) < size:
+      name = 'sparse'
+      size = 2 + (len(changed) * 4)
+
+  # A single run is the smallest a set all pixels rle can be,
+  # give up once there are too many runs to beat size
+  if size > 6:
+    limit = (size - 3) // 4
+    runs = [[1, pixels[0]]]
+    for pixel in pixels[1:]:
+      if pixel == runs[-1][1]:
+        runs[-1][0] += 1
+      elif len(runs) < limit:
+        runs.append([1, pixel])
+      else:
+        break
+    else:
+      name = 'rle'
+
+  if name == 'full':
+    return name, bytearray([CMD_SET_ALL_PIXELS]) + frame
+  elif name == 'sparse':
+    command = bytearray([CMD_SET_PIXELS, len(changed)])
+    for position in changed:
+      command.append(position)
+      command += pixels[position]
+  else:
+    command = bytearray([CMD_SET_ALL_PIXELS_RLE, len(runs)])
+    for length, pixel in runs:
+      command.append(length)
+      command += pixel
+  return name, command
+
+class Client(object):
+  '''
+  Talk to unicornd over its Unix socket
+
+  Commands are packed into buffers allocated up front. The
+  frame buffer holds a set all pixels command followed by a
+  show, so show_pixels() sends a whole frame in one write;
+  fill it through the pixels memoryview.
+
+  With extended True, show_frame() sends each frame using the
+  extended commands, picking the smallest encoding, followed
+  by show sequence. Older versions of unicornd disconnect on
+  the extended commands, so they are off by default.
+  '''
+  def __init__(self, path=SOCKET_PATH, extended=False):
+    self.path = path
+    self.extended = extended
+    self.sck = None
+    self.sequence = 0
+    self.encodings = {'full': 0, 'rle': 0, 'sparse': 0, 'none': 0}
+    self._last = None
+    self._show_sequence = bytearray(SHOW_SEQUENCE.size)
+    self._brightness = bytearray(SET_BRIGHTNESS.size)
+    self._pixel = bytearray(SET_PIXEL.size)
+    self._priority = bytearray(SET_PRIORITY.size)
+    self._frame = bytearray(FRAME_SIZE + 2)
+    self._frame[0] = CMD_SET_ALL_PIXELS
+    self._frame[-1] = CMD_SHOW
+    self._view = memoryview(self._frame)
+    self.pixels = self._view[1:-1]
+
+  def connect(self):
+    self.sck = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    self.sck.connect(self.path)
+
+  def set_brightness(self, brightness):
+    '''
+    Set the brightness between 0.0 and 1.0
+    '''
+    SET_BRIGHTNESS.pack_into(self._brightness, 0, CMD_SET_BRIGHTNESS, brightness)
+    self.sck.sendall(self._brightness)
+
+  def set_pixel(self, x, y, r, g, b):
+    SET_PIXEL.pack_into(self._pixel, 0, CMD_SET_PIXEL, x, y, r, g, b)
+    self.sck.sendall(self._pixel)
+    self._last = None
+
+  def set_priority(self, priority):
+    '''
+    Set where this client's frames are drawn by the frame
+    server, from -128 to 127, an extended command
+    '''
+    SET_PRIORITY.pack_into(self._priority, 0, CMD_SET_PRIORITY, priority)
+    self.sck.sendall(self._priority)
+
+  def set_all_pixels(self, pixels=None):
+    '''
+    Set every pixel, from pixels if given or else from
+    whatever has been written into the pixels memoryview
+    '''
+    if pixels is not None:
+      self.pixels[:] = pixels
+    self.sck.sendall(self._view[:-1])
+    self._last = self.pixels.tobytes()
+
+  def show(self):
+    self.sck.sendall(self._view[-1:])
+
+  def show_pixels(self, pixels=None):
+    '''
+    Set every pixel and show them, in a single write
+    '''
+    if pixels is not None:
+      self.pixels[:] = pixels
+    self.sck.sendall(self._frame)
+    self._last = self.pixels.tobytes()
+
+  def show_frame(self, pixels=None):
+    '''
+    Set every pixel and show them, in a single write, using
+    the smallest encoding when extended commands are enabled
+    '''
+    if not self.extended:
+      self.show_pixels(pixels)
+      return
+    if pixels is not None:
+      self.pixels[:] = pixels
+    frame = self.pixels.tobytes()
+    name, command = encode_frame(frame, self._last)
+    self.encodings[name] += 1
+    SHOW_SEQUENCE.pack_into(self._show_sequence, 0, CMD_SHOW_SEQUENCE, self.sequence)
+    self.sck.sendall(command + self._show_sequence)
+    self.sequence = (self.sequence + 1) & 0xffffffff
+    self._last = frame
+
+  def close(self):
+    if self.sck is not None:
+      self.sck.close()
+      self.sck = None
+
+class Server(object):
+  '''
+  Python stand-in for unicornd
+
+  Like the daemon it serves one client at a time and closes
+  the connection on an unknown command or a count over 64.
+  leds holds r, g, b bytes for every pixel in LED order, and
+  on_show, if given, is called with leds and the brightness
+  on every show.
+
+  sequence is the last frame number received with show
+  sequence, and missed counts the gaps in the numbering.
+  '''
+  def __init__(self, path=SOCKET_PATH, on_show=None):
+    self.path = path
+    self.on_show = on_show
+    self.leds = bytearray(FRAME_SIZE)
+    self.brightness = DEFAULT_BRIGHTNESS
+    self.shows = 0
+    self.sequence = None
+    self.missed = 0
+    self.sck = None
+    self._client = None
+    self._thread = None
+    self._running = False
+
+  def listen(self):
+    if os.path.exists(self.path):
+      os.unlink(self.path)
+    self.sck = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    self.sck.bind(self.path)
+    self.sck.listen(4)
+
+  def start(self):
+    '''
+    Listen and serve clients from a background thread
+    '''
+    self.listen()
+    self._running = True
+    self._thread = threading.Thread(target=self.serve_forever)
+    self._thread.daemon = True
+    self._thread.start()
+
+  def stop(self):
+    self._running = False
+    if self.sck is not None:
+      # Wake up accept() so the thread can finish
+      try:
+        self.sck.shutdown(socket.SHUT_RDWR)
+      except socket.error:
+        pass
+      self.sck.close()
+      self.sck = None
+    client = self._client
+    if client is not None:
+      try:
+        client.shutdown(socket.SHUT_RDWR)
+      except socket.error:
+        pass
+    if self._thread is not None:
+      self._thread.join()
+      self._thread = None
+    if os.path.exists(self.path):
+      os.unlink(self.path)
+
+  def serve_forever(self):
+    if self.sck is None:
+      self.listen()
+      self._running = True
+    while self._running:
+      try:
+        client, address = self.sck.accept()
+      except (socket.error, AttributeError):
+        return
+      self._client = client
+      try:
+        self.handle(client.makefile('rb'))
+      except socket.error:
+        pass
+      finally:
+        self._client = None
+        client.close()
+
+  def handle(self, stream):
+    '''
+    Run the commands read from stream until the client
+    disconnects or sends something unknown
+    '''
+    self.sequence = None
+    while True:
+      code = stream.read(1)
+      if not code:
+        return
+      code = ord(code)
+
+      if code == CMD_SET_BRIGHTNESS:
+        data = stream.read(SET_BRIGHTNESS.size - 1)
+        if len(data) < SET_BRIGHTNESS.size - 1:
+          return
+        brightness = struct.unpack('=d', data)[0]
+        # unicornd ignores values it can't use
+        if 0.0 <= brightness <= 1.0:
+          self.brightness = brightness
+
+      elif code == CMD_SET_PIXEL:
+        data = stream.read(SET_PIXEL.size - 1)
+        if len(data) < SET_PIXEL.size - 1:
+          return
+        x, y, r, g, b = bytearray(data)
+        if x < 8 and y < 8:
+          index = pixel_index(x, y) * 3
+          self.leds[index:index + 3] = bytearray((r, g, b))
+
+      elif code == CMD_SET_ALL_PIXELS:
+        data = stream.read(FRAME_SIZE)
+        if len(data) < FRAME_SIZE:
+          return
+        self.leds[:] = to_leds(data)
+
+      elif code == CMD_SHOW or code == CMD_SHOW_SEQUENCE:
+        if code == CMD_SHOW_SEQUENCE:
+          data = stream.read(SHOW_SEQUENCE.size - 1)
+          if len(data) < SHOW_SEQUENCE.size - 1:
+            return
+          sequence = struct.unpack('=I', data)[0]
+          if self.sequence is not None:
+            self.missed += (sequence - self.sequence - 1) & 0xffffffff
+          self.sequence = sequence
+        self.shows += 1
+        if self.on_show is not None:
+          self.on_show(self.leds, self.brightness)
+
+      elif code == CMD_SET_PRIORITY:
+        if len(stream.read(SET_PRIORITY.size - 1)) < SET_PRIORITY.size - 1:
+          return
+
+      elif code == CMD_SET_PIXELS:
+        count = bytearray(stream.read(1))
+        if not count or count[0] > PIXEL_COUNT:
+          return
+        data = bytearray(stream.read(count[0] * 4))
+        if len(data) < count[0] * 4:
+          return
+        set_positions(self.leds, data)
+
+      elif code == CMD_SET_ALL_PIXELS_RLE:
+        count = bytearray(stream.read(1))
+        if not count or count[0] > PIXEL_COUNT:
+          return
+        data = bytearray(stream.read(count[0] * 4))
+        if len(data) < count[0] * 4 or not set_runs(self.leds, data):
+          return
+
+      else:
+        return
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+'''
+Compares the per-frame cost of gamma and white balance
+correction done in Python on every pixel before set_pixel,
+as apps had to, against the lookup tables applied by show()
+with unicornhat.gamma() and unicornhat.white_balance().
+
+Run it with the simulator backend, the time the LEDs take to
+update is set to zero so only the correction is measured:
+
+    UNICORNHAT_BACKEND=simulator python color_correction.py
+'''
+
+import time
+
+import unicornhat as unicorn
+
+FRAMES = 5000
+GAMMA = 2.2
+WHITE_BALANCE = (1.0, 0.85, 0.7)
+
+backend = unicorn.begin()
+if hasattr(backend, 'frame_time'):
+  backend.frame_time = 0.0
+
+def pixels(step):
+  return [[(((x * 32) + step) % 256, ((y * 32) + step) % 256, step % 256) for x in range(8)] for y in range(8)]
+
+def correct(value, channel):
+  return min(255, int(round(((value / 255.0) ** GAMMA) * WHITE_BALANCE[channel] * 255.0)))
+
+def python_correction(step):
+  for y, row in enumerate(pixels(step)):
+    for x, (r, g, b) in enumerate(row):
+      unicorn.set_pixel(x, y, correct(r, 0), correct(g, 1), correct(b, 2))
+  unicorn.show(force=True)
+
+def uncorrected(step):
+  unicorn.set_pixels(pixels(step))
+  unicorn.show(force=True)
+
+def time_frames(draw):
+  start = time.time()
+  for step in range(FRAMES):
+    draw(step)
+  return (time.time() - start) / FRAMES * 1000000
+
+print('per pixel in Python  {0:8.2f} us/frame'.format(time_frames(python_correction)))
+print('uncorrected          {0:8.2f} us/frame'.format(time_frames(uncorrected)))
+unicorn.gamma(GAMMA)
+unicorn.white_balance(*WHITE_BALANCE)
+print('lookup tables        {0:8.2f} us/frame'.format(time_frames(uncorrected)))
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+
+'''
+Measures the per-frame cost of temporal dithering, alone and
+through set_pixels() and show() with a float frame, against
+the 200 frames a second budget, and how far the levels shown
+are from the exact levels at brightness 0.2, averaged over
+time, with and without dithering. Needs NumPy.
+
+The exact levels come from the backend's transfer curve, for
+the simulator the rpi_ws281x gamma table and brightness scale
+it models the LEDs with.
+
+Run it with the simulator backend, the time the LEDs take to
+update is set to zero so only the dither is measured:
+
+    UNICORNHAT_BACKEND=simulator python dither.py
+'''
+
+import time
+
+import numpy
+
+import unicornhat as unicorn
+from unicornhat import dithering
+
+FRAMES = 2000
+BRIGHTNESS = 0.2
+
+backend = unicorn.begin()
+if hasattr(backend, 'frame_time'):
+  backend.frame_time = 0.0
+unicorn.brightness(BRIGHTNESS)
+level = int(BRIGHTNESS * 255)
+
+frame = numpy.random.rand(8, 8, 3) * 250
+
+def time_frames(draw):
+  start = time.time()
+  for step in range(FRAMES):
+    draw(step)
+  return (time.time() - start) / FRAMES * 1000000
+
+dither = dithering.Dither(unicorn.LED_COUNT, backend.transfer)
+values = frame.reshape(-1)
+print('Dither.frame()           {0:8.2f} us/frame'.format(time_frames(lambda step: dither.frame(values, level))))
+
+def draw(step):
+  unicorn.set_pixels(frame)
+  unicorn.show()
+
+print('set_pixels() and show()  {0:8.2f} us/frame, budget at 200 fps 5000 us'.format(time_frames(draw)))
+
+# A simulated strip keeps the levels the LEDs were sent, so
+# average them over time and compare with the exact levels
+if hasattr(backend, 'leds'):
+  values = numpy.empty((unicorn.LED_COUNT, 3))
+  values[unicorn._get_index_array()] = frame.reshape(-1, 3)
+  exact = numpy.interp(values.reshape(-1), numpy.arange(256), backend.transfer(level)[0])
+  for enabled in [False, True]:
+    unicorn.dither(enabled)
+    unicorn.set_pixels(frame)
+    shown = numpy.zeros(unicorn.LED_COUNT * 3)
+    for step in range(FRAMES):
+      unicorn.show(force=True)
+      shown += numpy.frombuffer(bytes(backend.leds), dtype=numpy.uint8)
+    print('dither={0:<6} mean error {1:.4f} levels'.format(str(enabled), numpy.abs((shown / FRAMES) - exact).mean()))
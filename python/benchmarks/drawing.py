@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+
+'''
+Compares filling shapes in examples/graphics.py a pixel at a
+time against the span based fills, on a clock face sized circle
+and a gauge needle triangle redrawn every frame, first with
+their masks worked out and then with the masks cached.
+
+Working out a small polygon's spans costs about as much as
+testing every pixel, so for shapes like the needle the gain
+comes from the cached mask.
+'''
+
+import os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples'))
+
+import graphics
+
+FRAMES = 10000
+WHITE = graphics.Color(255, 255, 255)
+RED = graphics.Color(255, 0, 0)
+
+def pixel_circle(drawing, x0, y0, r, col):
+  for y in range(-r, r + 1):
+    for x in range(-r, r + 1):
+      if (x * x) + (y * y) <= (r * r) + r:
+        drawing.pixel(x0 + x, y0 + y, col)
+
+def pixel_triangle(drawing, points, col):
+  (x0, y0), (x1, y1), (x2, y2) = points
+  area = ((x1 - x0) * (y2 - y0)) - ((x2 - x0) * (y1 - y0))
+  for y in range(drawing.height):
+    for x in range(drawing.width):
+      a = ((x1 - x0) * (y - y0)) - ((x - x0) * (y1 - y0))
+      b = ((x2 - x1) * (y - y1)) - ((x - x1) * (y2 - y1))
+      c = ((x0 - x2) * (y - y2)) - ((x - x2) * (y0 - y2))
+      if (a >= 0 and b >= 0 and c >= 0) if area >= 0 else (a <= 0 and b <= 0 and c <= 0):
+        drawing.pixel(x, y, col)
+
+def time_frames(draw):
+  drawing = graphics.Drawing()
+  start = time.time()
+  for step in range(FRAMES):
+    draw(drawing)
+  return (time.time() - start) / FRAMES * 1000000
+
+needle = [(4, 4), (7, 1), (3, 3)]
+
+print('circle, per pixel    {0:8.2f} us'.format(time_frames(lambda d: pixel_circle(d, 4, 4, 3, RED))))
+print('circle, spans        {0:8.2f} us'.format(time_frames(lambda d: d.spans(graphics._circle_fill(3), 4, 4, RED))))
+print('circle, cached mask  {0:8.2f} us'.format(time_frames(lambda d: d.circle(4, 4, 3, None, RED))))
+print('triangle, per pixel  {0:8.2f} us'.format(time_frames(lambda d: pixel_triangle(d, needle, WHITE))))
+print('triangle, spans      {0:8.2f} us'.format(time_frames(lambda d: d.spans(graphics._polygon_fill(needle), 0, 0, WHITE))))
+print('triangle, cached     {0:8.2f} us'.format(time_frames(lambda d: d.polygon(needle, None, WHITE))))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+'''
+Compares the time to work out a frame of the demo effects with
+the original per-pixel functions, called 64 times a frame and
+128 times while cross fading, against unicornhat.effects, which
+works out every pixel at once with NumPy.
+'''
+
+import colorsys, math, timeit
+
+from unicornhat import effects
+
+FRAMES = 200
+
+# The original per-pixel swirl and tunnel from examples/demo.py
+def swirl(x, y, step):
+  x -= 4
+  y -= 4
+  dist = math.sqrt(pow(x, 2) + pow(y, 2)) / 2.0
+  angle = (step / 10.0) + (dist * 1.5)
+  s = math.sin(angle)
+  c = math.cos(angle)
+  xs = x * c - y * s
+  ys = x * s + y * c
+  r = abs(xs + ys) * 64.0 - 20
+  return (r, r + (s * 130), r + (c * 130))
+
+def tunnel(x, y, step):
+  speed = step / 100.0
+  x -= 4
+  y -= 4
+  x += math.sin(step / 27.0) * 2
+  y += math.cos(step / 18.0) * 2
+  if y == 0:
+    angle = -(math.pi / 2) if x < 0 else (math.pi / 2)
+  else:
+    angle = math.atan(x / y)
+  if y > 0:
+    angle += math.pi
+  angle /= 2 * math.pi
+  shade = min(math.sqrt(math.pow(x, 2) + math.pow(y, 2)) / 2.1, 1)
+  angle += speed
+  depth = speed + (math.sqrt(math.pow(x, 2) + math.pow(y, 2)) / 10)
+  col1 = colorsys.hsv_to_rgb((step % 255) / 255.0, 1, .8)
+  col2 = colorsys.hsv_to_rgb((step % 255) / 255.0, 1, .3)
+  col = col1 if int(abs(angle * 6.0)) % 2 == 0 else col2
+  td = .3 if int(abs(depth * 3.0)) % 2 == 0 else 0
+  return ((col[0] + td) * shade * 255, (col[1] + td) * shade * 255, (col[2] + td) * shade * 255)
+
+def per_pixel(effect, next_effect, step, ratio):
+  frame = []
+  for y in range(8):
+    for x in range(8):
+      r, g, b = effect(x, y, step)
+      if next_effect is not None:
+        r2, g2, b2 = next_effect(x, y, step)
+        r = r * ratio + r2 * (1.0 - ratio)
+        g = g * ratio + g2 * (1.0 - ratio)
+        b = b * ratio + b2 * (1.0 - ratio)
+      frame.append((int(max(0, min(255, r))), int(max(0, min(255, g))), int(max(0, min(255, b)))))
+  return frame
+
+def time_frames(draw):
+  return timeit.timeit(lambda: [draw(step) for step in range(FRAMES)], number=1) / FRAMES * 1000
+
+single = effects.Playlist([effects.tunnel], duration=FRAMES, fade=0)
+fading = effects.Playlist([effects.tunnel, effects.swirl], duration=FRAMES, fade=FRAMES)
+
+print('per pixel             {0:8.3f} ms/frame'.format(time_frames(lambda step: per_pixel(tunnel, None, step, 1.0))))
+print('per pixel, fading     {0:8.3f} ms/frame'.format(time_frames(lambda step: per_pixel(tunnel, swirl, step, 0.5))))
+print('vectorised            {0:8.3f} ms/frame'.format(time_frames(single.frame)))
+print('vectorised, fading    {0:8.3f} ms/frame'.format(time_frames(lambda step: fading.frame(step + 1))))
+
+large = effects.Playlist([effects.tunnel, effects.swirl], duration=FRAMES, fade=FRAMES, width=32, height=32)
+print('vectorised 32x32, fading {0:5.3f} ms/frame'.format(time_frames(lambda step: large.frame(step + 1))))
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+'''
+Measures how many frames per second the UnicornHat emulator
+can receive from the test/UnicornHat.py client, with the
+binary protocol and the old comma separated hex protocol.
+
+Each protocol is run twice: waiting for every frame to be
+handed to the socket, which measures the protocol itself, and
+free running, where the client drops the frames it can't send.
+
+Only the emulator's TCP server is started, no window is
+opened, so this measures the protocol and not Tk.
+'''
+
+import os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'test'))
+
+import UnicornHat_Emulator as emulator
+
+FRAMES = 5000
+
+received = [0]
+
+def on_message(command, payload):
+  if command in ['frame', 'pixels']:
+    received[0] += 1
+
+server = emulator.EmulatorServer(on_message)
+server.start()
+
+import UnicornHat as unicorn
+
+def run(protocol, wait):
+  unicorn.protocol(protocol)
+  unicorn.flush()
+  stats = unicorn.get_frame_stats()
+  received[0] = 0
+  start = time.time()
+  for step in range(FRAMES):
+    unicorn.set_pixel(step % 8, (step // 8) % 8, step % 256, 0, 0)
+    unicorn.show()
+    if wait:
+      unicorn.flush()
+  unicorn.flush()
+  sent = unicorn.get_frame_stats()['sent'] - stats['sent']
+  while received[0] < sent:
+    time.sleep(0.001)
+  elapsed = time.time() - start
+  dropped = unicorn.get_frame_stats()['dropped'] - stats['dropped']
+  return received[0] / elapsed, dropped
+
+for protocol in ['binary', 'text']:
+  for wait in [True, False]:
+    rate, dropped = run(protocol, wait)
+    mode = 'waiting' if wait else 'free running'
+    print('{0:<8} {1:<14} {2:10.1f} frames/s received, {3} dropped'.format(protocol, mode, rate, dropped))
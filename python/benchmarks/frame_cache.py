@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+
+'''
+Compares the cost of drawing frames of a periodic effect, a
+hue cycle repeating every 255 steps, every frame against the
+same effect wrapped by unicornhat.cache.memoize(), which only
+draws each phase once and copies it out of the cache after.
+'''
+
+import colorsys, time
+
+import unicornhat as unicorn
+from unicornhat import cache
+
+PERIOD = 255
+FRAMES = PERIOD * 4
+
+def hue_cycle(step):
+  for y in range(8):
+    for x in range(8):
+      r, g, b = colorsys.hsv_to_rgb(((step + (x * 8) + y) % PERIOD) / float(PERIOD), 1, 1)
+      unicorn.set_pixel(x, y, int(r * 255), int(g * 255), int(b * 255))
+
+def time_frames(draw):
+  start = time.time()
+  for step in range(FRAMES):
+    draw(step)
+  return (time.time() - start) / FRAMES * 1000
+
+frames = cache.FrameCache()
+print('uncached          {0:8.4f} ms/frame'.format(time_frames(hue_cycle)))
+print('cached            {0:8.4f} ms/frame'.format(time_frames(cache.memoize(hue_cycle, PERIOD, cache=frames))))
+print('cached, warm      {0:8.4f} ms/frame'.format(time_frames(cache.memoize(hue_cycle, PERIOD, cache=frames))))
+print(frames.get_stats())
+
+small = cache.FrameCache(max_bytes=100 * unicorn.LED_COUNT * 3)
+print('cached, too small {0:8.4f} ms/frame'.format(time_frames(cache.memoize(hue_cycle, PERIOD, cache=small))))
+print(small.get_stats())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+'''
+Runs the multi-client frame server with a growing number of
+simulated clients, each a separate process sending whole frames
+as fast as it can, and measures how many shows the server
+handles each second, how many composited frames it outputs
+and how long compositing takes.
+'''
+
+import asyncio, multiprocessing, os, tempfile, time
+
+from unicornhat import frameserver, unicornd
+
+DURATION = 2.0
+FPS = 60
+
+path = os.path.join(tempfile.mkdtemp(), 'unicornd.socket')
+
+def client(number, start):
+  client = unicornd.Client(path)
+  client.connect()
+  client.set_priority(number % 4)
+  frame = bytearray(unicornd.PIXEL_COUNT * 3)
+  frame[number % len(frame)] = 255
+  step = 0
+  while time.time() < start + DURATION:
+    frame[0] = step % 256
+    client.show_pixels(frame)
+    step += 1
+  client.close()
+
+async def measure(clients):
+  server = frameserver.FrameServer(lambda frame, brightness: None, path, FPS)
+  await server.start()
+  start = time.time() + 0.5
+  processes = [multiprocessing.Process(target=client, args=(number, start)) for number in range(clients)]
+  for process in processes:
+    process.start()
+  await asyncio.sleep(start - time.time())
+  shows, frames = server.shows, server.frames
+  await asyncio.sleep(DURATION)
+  shows, frames = server.shows - shows, server.frames - frames
+  while any(process.is_alive() for process in processes):
+    await asyncio.sleep(0.05)
+  await server.stop()
+  return shows / DURATION, frames / DURATION, server.render_time / max(server.frames, 1)
+
+for clients in [1, 4, 16, 64]:
+  shows, frames, composite_time = asyncio.run(measure(clients))
+  print('{0:3} clients {1:10.1f} shows/s {2:6.1f} frames/s {3:8.3f} ms/frame'.format(clients, shows, frames, composite_time * 1000))
@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+
+'''
+Measures how long a fresh Python process takes to import
+unicornhat, against an empty interpreter start up. Nothing
+touches the hardware until begin() or the first show(), so
+this is the start up cost of a tool that only works with
+frames.
+'''
+
+import subprocess, sys, time
+
+RUNS = 20
+
+def measure(code):
+  best = None
+  for run in range(RUNS):
+    start = time.time()
+    subprocess.check_call([sys.executable, '-c', code])
+    elapsed = time.time() - start
+    best = elapsed if best is None else min(best, elapsed)
+  return best
+
+baseline = measure('pass')
+imported = measure('import unicornhat')
+
+print('python start up    {0:8.1f} ms'.format(baseline * 1000))
+print('import unicornhat  {0:8.1f} ms'.format(imported * 1000))
+print('unicornhat cost    {0:8.1f} ms'.format((imported - baseline) * 1000))
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+'''
+Measures the per-frame cost of writing a full 8x8 frame,
+including a NumPy array frame if NumPy is installed.
+
+"legacy" recreates the translation set_pixel used to do on every
+call: bounds checks, flipping y, branching on rotation and indexing
+the nested map. The other rows use the precomputed rotation tables.
+'''
+
+import timeit
+import unicornhat as unicorn
+
+FRAMES = 2000
+
+unicorn.rotation(90)
+
+frame = [[(x * 32, y * 32, 128) for x in range(8)] for y in range(8)]
+
+def legacy_index(x, y):
+  if x > 7 or x < 0:
+    raise ValueError('X position must be between 0 and 7')
+  if y > 7 or y < 0:
+    raise ValueError('Y position must be between 0 and 7')
+
+  y = 7-y
+
+  if unicorn._rotation == 90:
+    x,y = y,7-x
+  if unicorn._rotation == 180:
+    x,y = 7-x,7-y
+  if unicorn._rotation == 270:
+    x,y = 7-y,x
+
+  return unicorn.map[x][y]
+
+def legacy():
+  for y in range(8):
+    for x in range(8):
+      r, g, b = frame[y][x]
+      index = legacy_index(x, y) * 3
+      unicorn._buffer[index:index + 3] = (r, g, b)
+
+def set_pixel():
+  for y in range(8):
+    for x in range(8):
+      r, g, b = frame[y][x]
+      unicorn.set_pixel(x, y, r, g, b)
+
+def set_row():
+  for y in range(8):
+    unicorn.set_row(y, frame[y])
+
+def set_pixels():
+  unicorn.set_pixels(frame)
+
+tests = [legacy, set_pixel, set_row, set_pixels]
+
+try:
+  import numpy
+  array_frame = numpy.array(frame, dtype=numpy.uint8)
+
+  def set_pixels_array():
+    unicorn.set_pixels(array_frame)
+
+  tests.append(set_pixels_array)
+except ImportError:
+  pass
+
+for test in tests:
+  elapsed = min(timeit.repeat(test, number=FRAMES, repeat=3))
+  print('{0:<18} {1:8.1f} us/frame'.format(test.__name__, (elapsed / FRAMES) * 1e6))
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+
+'''
+Measures frame throughput of a render loop that spends a fixed
+amount of time computing each frame, with blocking show() against
+show(block=False), which overlaps computing the next frame with
+sending out the last one.
+'''
+
+import time
+import unicornhat as unicorn
+
+FRAMES = 500
+COMPUTE_TIME = 0.002
+
+def compute(step):
+  # Stand in for an effect, busy for COMPUTE_TIME seconds
+  end = time.time() + COMPUTE_TIME
+  while time.time() < end:
+    pass
+  colour = step % 256
+  unicorn.set_pixels([[(colour, 255 - colour, x * 32) for x in range(8)] for y in range(8)])
+
+def run(block):
+  start = time.time()
+  for step in range(FRAMES):
+    compute(step)
+    unicorn.show(block=block)
+  unicorn.wait()
+  return FRAMES / (time.time() - start)
+
+for block in [True, False]:
+  print('block={0:<6} {1:8.1f} frames/s'.format(str(block), run(block)))
+
+unicorn.off()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+
+'''
+Compares frames per second driving UnicornHat and a 64 LED
+strip as two separate outputs, each with its own show(), against
+a strip added with unicornhat.add_strip(), which shares a single
+show() and transfer with UnicornHat.
+
+Run it with the simulator backend, which models the transfer
+time of each output:
+
+    UNICORNHAT_BACKEND=simulator python strip.py
+'''
+
+import time
+
+import unicornhat as unicorn
+from unicornhat import backends
+
+FRAMES = 500
+STRIP_LEDS = 64
+
+def frame(step):
+  unicorn.set_pixels(bytes(bytearray([step % 256]) * (unicorn.LED_COUNT * 3)))
+  return bytes(bytearray([255 - (step % 256)]) * (STRIP_LEDS * 3))
+
+def separate():
+  # A second output with its own transfer, as a second process would need
+  other = backends.Simulator(STRIP_LEDS)
+  other.begin()
+  start = time.time()
+  for step in range(FRAMES):
+    leds = frame(step)
+    unicorn.show()
+    other.show(leds)
+  return FRAMES / (time.time() - start)
+
+def shared(strip):
+  start = time.time()
+  for step in range(FRAMES):
+    strip.set_leds(frame(step))
+    unicorn.show()
+  return FRAMES / (time.time() - start)
+
+print('separate outputs     {0:8.1f} frames/s'.format(separate()))
+unicorn.set_backend('simulator')
+print('add_strip()          {0:8.1f} frames/s'.format(shared(unicorn.add_strip(STRIP_LEDS))))
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+
+'''
+Compares the per-frame cost of scrolling a message by drawing
+the glyphs of the visible part with set_pixel every frame
+against unicornhat.text.Marquee, which renders the message into
+a strip of columns once and copies the visible slice.
+'''
+
+import time
+
+import unicornhat as unicorn
+from unicornhat import text
+
+MESSAGE = 'The quick brown fox jumps over the lazy dog 0123456789'
+FRAMES = 5000
+
+def redraw(step):
+  # Work out which glyph column lands on each display column
+  font = text.DEFAULT_FONT
+  columns = font.columns(MESSAGE)
+  offset = (step % len(columns)) - 8
+  for x in range(8):
+    position = offset + x
+    bits = columns[position] if 0 <= position < len(columns) else 0
+    for y in range(8):
+      if 0 <= y - 1 < font.height and (bits >> (y - 1)) & 1:
+        unicorn.set_pixel(x, y, 255, 255, 255)
+      else:
+        unicorn.set_pixel(x, y, 0, 0, 0)
+
+def time_frames(draw):
+  start = time.time()
+  for step in range(FRAMES):
+    draw(step)
+  return (time.time() - start) / FRAMES * 1000000
+
+start = time.time()
+marquee = text.Marquee(MESSAGE, speed=60, fps=60)
+print('render strip       {0:8.2f} us'.format((time.time() - start) * 1000000))
+print('redraw glyphs      {0:8.2f} us/frame'.format(time_frames(redraw)))
+print('marquee            {0:8.2f} us/frame'.format(time_frames(marquee.draw)))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+'''
+Measures how many frames per second a client can send to
+unicornd, using the Python stand-in server, either as 64 set
+pixel commands and a show or as a single set all pixels and
+show write, plus unicornhat itself through the unicornd backend.
+
+The extended client sends frames where a few pixels change, as
+set pixels, and flat frames, as run length encoded frames.
+'''
+
+import os, tempfile, time
+
+import unicornhat
+from unicornhat import backends, unicornd
+
+FRAMES = 2000
+
+path = os.path.join(tempfile.mkdtemp(), 'unicornd.socket')
+server = unicornd.Server(path)
+server.start()
+
+def finish(shows):
+  # Wait for the server to catch up with the client
+  while server.shows < shows:
+    time.sleep(0.0005)
+
+def per_pixel(client):
+  for step in range(FRAMES):
+    for x in range(8):
+      for y in range(8):
+        client.set_pixel(x, y, step % 256, x * 32, y * 32)
+    client.show()
+
+def whole_frame(client):
+  frame = bytearray(unicornd.PIXEL_COUNT * 3)
+  for step in range(FRAMES):
+    frame[0] = step % 256
+    client.show_pixels(frame)
+
+def few_pixels(client):
+  frame = bytearray(unicornd.PIXEL_COUNT * 3)
+  for step in range(FRAMES):
+    frame[(step * 3) % len(frame)] = step % 256
+    client.show_frame(frame)
+
+def flat(client):
+  frame = bytearray(unicornd.PIXEL_COUNT * 3)
+  for step in range(FRAMES):
+    frame[:] = bytearray((step % 256, 0, 0)) * unicornd.PIXEL_COUNT
+    client.show_frame(frame)
+
+def time_client(test, extended=False):
+  client = unicornd.Client(path, extended)
+  client.connect()
+  shows = server.shows + FRAMES
+  start = time.time()
+  test(client)
+  finish(shows)
+  elapsed = time.time() - start
+  client.close()
+  return FRAMES / elapsed, client.encodings
+
+def time_unicornhat():
+  unicornhat.set_backend(backends.Unicornd(unicornhat.LED_COUNT, path))
+  unicornhat.begin()
+  shows = server.shows + FRAMES
+  start = time.time()
+  for step in range(FRAMES):
+    unicornhat.set_pixel(step % 8, (step // 8) % 8, step % 256, 0, 0)
+    unicornhat.show()
+  finish(shows)
+  return FRAMES / (time.time() - start)
+
+for name, test, extended in [
+    ('set_pixel x 64 + show', per_pixel, False),
+    ('show_pixels', whole_frame, False),
+    ('one pixel, full', few_pixels, False),
+    ('one pixel, extended', few_pixels, True),
+    ('flat, full', flat, False),
+    ('flat, extended', flat, True)]:
+  rate, encodings = time_client(test, extended)
+  used = ', '.join(['{0} {1}'.format(key, value) for key, value in sorted(encodings.items()) if value])
+  print('{0:<22} {1:10.1f} frames/s  {2}'.format(name, rate, used if extended else ''))
+print('{0:<22} {1:10.1f} frames/s'.format('unicornhat backend', time_unicornhat()))
@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+
+'''
+Plays the sprite sheet animations from c/unicorn/anim, or any
+PNG strip of 8x8 frames, with the unicornhat sprite player.
+
+The first run converts the PNG into a cache of frames ready for
+UnicornHat, every run after that starts instantly.
+
+Usage: sudo python anim.py ../../c/unicorn/anim/rainbow.png [fps] [brightness]
+'''
+
+import sys
+import unicornhat as unicorn
+from unicornhat import sprite
+
+if len(sys.argv) < 2:
+  exit('Usage: {0} sheet.png [fps] [brightness]'.format(sys.argv[0]))
+
+fps = float(sys.argv[2]) if len(sys.argv) > 2 else 20
+unicorn.brightness(float(sys.argv[3]) if len(sys.argv) > 3 else 0.2)
+
+animation = sprite.Sprite(sys.argv[1])
+print('Playing {0} frames, cached in {1}'.format(len(animation), animation.cache))
+
+try:
+  animation.play(fps, loops=None)
+except KeyboardInterrupt:
+  pass
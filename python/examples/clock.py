@@ -9,17 +9,12 @@ class UnicornDrawing(Drawing):
     Drawing.__init__(self,8,8)
 
   '''
-  All drawing operations use the pixel method
-  so we override it for UnicornHat
+  Copy the whole drawing to UnicornHat
+  and update the display
   '''
-  def pixel(self, x, y, col):
-    if x < 0 or x > 7 or y < 0 or y > 7:
-      return False
-    self.buffer[(x,y)] = col
-    unicorn.set_pixel(x, y, col.r, col.g, col.b)
-
   def show(self):
-  	unicorn.show()
+    self.blit_to(unicorn)
+    unicorn.show()
 
 d = UnicornDrawing()
 
@@ -2,19 +2,18 @@
 This file is used in UnicornHat examples
 for drawing things.
 '''
-import colorsys, math
+import collections, colorsys, math
 
-class Color():
-  def __init__(self, r, g, b):
-    self.r = r
-    self.g = g
-    self.b = b
+class Color(collections.namedtuple('Color', 'r g b')):
+  '''
+  An r, g, b colour with values 0 to 255, a plain
+  tuple underneath so it can be written straight into
+  a Drawing and plain (r, g, b) tuples work too
+  '''
+  __slots__ = ()
 
   def __str__(self):
-    r = hex(self.r)[2:]
-    g = hex(self.g)[2:]
-    b = hex(self.b)[2:]
-    return ''.join([r,g,b])
+    return '{0:02x}{1:02x}{2:02x}'.format(*self)
 
   def rgb(self):
     return (self.r, self.g, self.b)
@@ -22,29 +21,184 @@ class Color():
   def hsv(self):
     return colorsys.rgb_to_hsv(self.r, self.g, self.b)
 
+BLACK = Color(0, 0, 0)
+
+'''
+Masks of shapes drawn before, as lists of (y, x_start, x_end)
+spans relative to the shape's position, so shapes drawn again
+at the same size are a few slice copies instead of rasterising.
+The oldest are dropped beyond MASK_CACHE_SIZE.
+'''
+MASK_CACHE_SIZE = 256
+_masks = collections.OrderedDict()
+
+def _mask(key, build):
+  spans = _masks.get(key)
+  if spans is None:
+    spans = tuple(build())
+    _masks[key] = spans
+    if len(_masks) > MASK_CACHE_SIZE:
+      _masks.popitem(last=False)
+  return spans
+
+def _circle_points(r):
+  # Midpoint circle, yields the x, y offsets of one octant
+  f = 1 - r
+  ddf_x = 1
+  ddf_y = -2 * r
+  x = 0
+  y = r
+  yield x, y
+  while x < y:
+    if f >= 0:
+        y -= 1
+        ddf_y += 2
+        f += ddf_y
+    x += 1
+    ddf_x += 2
+    f += ddf_x
+    yield x, y
+
+def _circle_outline(r):
+  points = set()
+  for x, y in _circle_points(r):
+    points.update([(x, y), (-x, y), (x, -y), (-x, -y), (y, x), (-y, x), (y, -x), (-y, -x)])
+  return [(y, x, x) for x, y in sorted(points, key=lambda point: (point[1], point[0]))]
+
+def _circle_fill(r):
+  # The widest span the outline reaches on each row
+  widths = {}
+  for x, y in _circle_points(r):
+    for row, half in [(y, x), (-y, x), (x, y), (-x, y)]:
+      widths[row] = max(widths.get(row, 0), half)
+  return [(row, -half, half) for row, half in sorted(widths.items())]
+
+def _line_points(x0, y0, x1, y1):
+  # Bresenham, yields every point of the line
+  s = abs(y1 - y0) > abs(x1 - x0)
+  if s:
+    x0, y0 = y0, x0
+    x1, y1 = y1, x1
+
+  if x0 > x1:
+    x0, x1 = x1, x0
+    y0, y1 = y1, y0
+
+  dx = x1 - x0
+  dy = abs(y1 - y0)
+
+  err = dx / 2
+
+  if y0 < y1:
+    ystep = 1
+  else:
+    ystep = -1
+
+  while x0<=x1:
+    if s:
+      yield y0, x0
+    else:
+      yield x0, y0
+    err -= dy
+
+    if err < 0:
+      y0 += ystep
+      err += dx
+
+    x0+=1
+
+def _polygon_fill(points):
+  '''
+  Spans covering a polygon, even-odd filled between its edges
+  at every row, plus the pixels of the edges themselves
+  '''
+  # Each edge is walked over just the rows it crosses, adding
+  # where it crosses each to [crossings, spans] for the row,
+  # along with the run of its own pixels on each row
+  rows = {}
+  previous = points[-1]
+  for xb, yb in points:
+    xa, ya = previous
+    previous = (xb, yb)
+    if ya != yb:
+      if ya > yb:
+        lx, ly, hx, hy = xb, yb, xa, ya
+      else:
+        lx, ly, hx, hy = xa, ya, xb, yb
+      dx = hx - lx
+      dy = hy - ly
+      for y in range(ly, hy):
+        rows.setdefault(y, [[], []])[0].append(lx + (float((y - ly) * dx) / dy))
+    run_y = None
+    for x, y in _line_points(xa, ya, xb, yb):
+      if y != run_y:
+        if run_y is not None:
+          rows.setdefault(run_y, [[], []])[1].append((run_start, run_end))
+        run_y, run_start, run_end = y, x, x
+      elif x < run_start:
+        run_start = x
+      elif x > run_end:
+        run_end = x
+    rows.setdefault(run_y, [[], []])[1].append((run_start, run_end))
+
+  # Pair up the crossings and merge overlapping and touching
+  # spans on each row
+  spans = []
+  for y in sorted(rows):
+    crossings, row = rows[y]
+    if crossings:
+      crossings.sort()
+      for left, right in zip(crossings[0::2], crossings[1::2]):
+        left = int(math.ceil(left))
+        right = int(math.floor(right))
+        if left <= right:
+          row.append((left, right))
+    row.sort()
+    start, end = row[0]
+    for next_start, next_end in row:
+      if next_start > end + 1:
+        spans.append((y, start, end))
+        start, end = next_start, next_end
+      elif next_end > end:
+        end = next_end
+    spans.append((y, start, end))
+  return spans
+
 class Drawing():
+  '''
+  A canvas of width x height pixels, stored as r, g, b
+  bytes row by row in a bytearray. Anything drawn outside
+  the canvas is clipped.
+
+  blit_to(unicornhat) copies the canvas to UnicornHat in
+  one go, and array gives a NumPy view of the same memory.
+  '''
   def __init__(self,width=8,height=8):
     self.width = width
     self.height = height
-    self.buffer = {}
-    for x in range(width):
-      for y in range(height):
-        self.buffer[(x,y)] = Color(0,0,0)
+    self.buffer = bytearray(width * height * 3)
+
+  @property
+  def array(self):
+    '''
+    The canvas as a (height, width, 3) uint8 NumPy
+    array sharing memory with buffer
+    '''
+    import numpy
+    return numpy.frombuffer(self.buffer, dtype=numpy.uint8).reshape(self.height, self.width, 3)
 
-  def fill(self, col = Color(0,0,0)):
-    for x in range(self.width):
-      for y in range(self.height):
-        self.pixel(x, y, col)
+  def fill(self, col = BLACK):
+    self.buffer[:] = bytearray(col) * (self.width * self.height)
 
   def clear(self):
-    self.fill(Color(0,0,0))
+    self.fill(BLACK)
 
   '''
   Creates a color tuple from r, g, b elements
   with values 0 to 255
   '''
   def color_from_rgb(self, r, g, b):
-    return (r, g, b)
+    return Color(r, g, b)
 
   '''
   Creates a color tuple from h, s, v elements
@@ -52,87 +206,146 @@ class Drawing():
   '''
   def color_from_hsv(self, h, s, v):
     rgb = colorsys.hsv_to_rgb(h, s, v)
-    return color_from_rgb( int(rgb[0]*255), int(rgb[1]*255), int(rgb[2]*255) )
+    return self.color_from_rgb( int(rgb[0]*255), int(rgb[1]*255), int(rgb[2]*255) )
 
   def pixel(self, x, y, col):
-    self.buffer[(x,y)] = col
-
-  def circle(self, x0, y0, r, col=Color(0,0,0), fill=None):
-    f = 1 - r
-    ddf_x = 1
-    ddf_y = -2 * r
-    x = 0
-    y = r
-    self.pixel(x0, y0 + r, col)
-    self.pixel(x0, y0 - r, col)
-    self.pixel(x0 + r, y0, col)
-    self.pixel(x0 - r, y0, col)
-
-    while x < y:
-      if f >= 0: 
-          y -= 1
-          ddf_y += 2
-          f += ddf_y
-      x += 1
-      ddf_x += 2
-      f += ddf_x
-      self.pixel(x0 + x, y0 + y, col)
-      self.pixel(x0 - x, y0 + y, col)
-      self.pixel(x0 + x, y0 - y, col)
-      self.pixel(x0 - x, y0 - y, col)
-      self.pixel(x0 + y, y0 + x, col)
-      self.pixel(x0 - y, y0 + x, col)
-      self.pixel(x0 + y, y0 - x, col)
-      self.pixel(x0 - y, y0 - x, col)
+    if x < 0 or y < 0 or x >= self.width or y >= self.height:
+      return False
+    index = ((y * self.width) + x) * 3
+    self.buffer[index:index + 3] = col
+    return True
 
-  def circle_line(self, origin_x, origin_y, radius, angle, col):
-    angle = (angle / 360.0) * (2*math.pi)
+  def get_pixel(self, x, y):
+    if x < 0 or y < 0 or x >= self.width or y >= self.height:
+      return None
+    index = ((y * self.width) + x) * 3
+    return Color(*self.buffer[index:index + 3])
 
-    x = origin_x + radius * math.sin(angle)
-    y = origin_y + radius * math.cos(angle)
-
-    self.line( origin_x, origin_y, int(round(x)), int(round(y)), col )
+  def blit_to(self, unicornhat, x=0, y=0):
+    '''
+    Copy the canvas to unicornhat's buffer in a single call,
+    x, y is the canvas position shown at the top left, any
+    of the display outside the canvas is black
+    '''
+    width, height = unicornhat.get_shape()
+    if (x, y, width, height) == (0, 0, self.width, self.height):
+      unicornhat.set_pixels(self.buffer)
+      return
 
-  def line(self, x0, y0, x1, y1, col=Color(0,0,0)):
-    s = abs(y1 - y0) > abs(x1 - x0)
-    if s:
-      x0, y0 = y0, x0
-      x1, y1 = y1, x1
+    frame = bytearray(width * height * 3)
+    left = max(x, 0)
+    right = min(x + width, self.width)
+    if right > left:
+      for row in range(max(y, 0), min(y + height, self.height)):
+        start = ((row * self.width) + left) * 3
+        offset = (((row - y) * width) + (left - x)) * 3
+        frame[offset:offset + ((right - left) * 3)] = self.buffer[start:start + ((right - left) * 3)]
+    unicornhat.set_pixels(frame)
 
+  def span(self, y, x0, x1, col):
+    '''
+    Draw a horizontal run of pixels from x0 to x1
+    inclusive, clipped to the canvas
+    '''
+    if y < 0 or y >= self.height:
+      return
+    x0 = max(x0, 0)
+    x1 = min(x1, self.width - 1)
     if x0 > x1:
-      x0, x1 = x1, x0
-      y0, y1 = y1, y0
+      return
+    start = ((y * self.width) + x0) * 3
+    self.buffer[start:start + ((x1 - x0 + 1) * 3)] = bytearray(col) * (x1 - x0 + 1)
 
-    dx = x1 - x0
-    dy = abs(y1 - y0)
+  def spans(self, spans, x, y, col):
+    '''
+    Draw a list of (y, x_start, x_end) spans offset by x, y
+    '''
+    col = bytearray(col)
+    width = self.width
+    buffer = self.buffer
+    for row, start, end in spans:
+      row += y
+      if row < 0 or row >= self.height:
+        continue
+      start = max(x + start, 0)
+      end = min(x + end, width - 1)
+      if start <= end:
+        index = ((row * width) + start) * 3
+        buffer[index:index + ((end - start + 1) * 3)] = col * (end - start + 1)
 
-    err = dx / 2
+  def rect(self, x, y, width, height, col=BLACK, fill=None):
+    '''
+    Draw a rectangle outline in col, filled with fill if
+    given, col None draws no outline
+    '''
+    if width <= 0 or height <= 0:
+      return
+    if fill is not None:
+      for row in range(y, y + height):
+        self.span(row, x, x + width - 1, fill)
+    if col is None:
+      return
+    self.span(y, x, x + width - 1, col)
+    self.span(y + height - 1, x, x + width - 1, col)
+    for row in range(y + 1, y + height - 1):
+      self.span(row, x, x, col)
+      self.span(row, x + width - 1, x + width - 1, col)
 
-    ystep = 0
+  def circle(self, x0, y0, r, col=BLACK, fill=None):
+    '''
+    Draw a circle outline in col, filled with fill if
+    given, col None draws no outline
+    '''
+    if fill is not None:
+      self.spans(_mask(('circle_fill', r), lambda: _circle_fill(r)), x0, y0, fill)
+    if col is not None:
+      self.spans(_mask(('circle', r), lambda: _circle_outline(r)), x0, y0, col)
 
-    if y0 < y1:
-      ystep = 1
-    else:
-      ystep = -1
+  def polygon(self, points, col=BLACK, fill=None):
+    '''
+    Draw a polygon outline in col through a list of
+    (x, y) points, filled with fill if given, col None
+    draws no outline
+    '''
+    points = [(int(x), int(y)) for x, y in points]
+    if not points:
+      return
+    # Masks are cached relative to the top left corner, so
+    # the same shape anywhere on the canvas shares one
+    left = min(x for x, y in points)
+    top = min(y for x, y in points)
+    shape = [(x - left, y - top) for x, y in points]
+    if fill is not None:
+      self.spans(_mask(('polygon', tuple(shape)), lambda: _polygon_fill(shape)), left, top, fill)
+    if col is None:
+      return
+    for (xa, ya), (xb, yb) in zip(points, points[1:] + points[:1]):
+      self.line(xa, ya, xb, yb, col)
 
-    while x0<=x1:
-      if s:
-        self.pixel(y0, x0, col)
-      else:
-        self.pixel(x0, y0, col)
-      err -= dy
+  def triangle(self, x0, y0, x1, y1, x2, y2, col=BLACK, fill=None):
+    '''
+    Draw a triangle outline in col, filled with fill if
+    given, col None draws no outline
+    '''
+    self.polygon([(x0, y0), (x1, y1), (x2, y2)], col, fill)
 
-      if err < 0:
-        y0 += ystep
-        err += dx
+  def circle_line(self, origin_x, origin_y, radius, angle, col):
+    angle = (angle / 360.0) * (2*math.pi)
+
+    x = origin_x + radius * math.sin(angle)
+    y = origin_y + radius * math.cos(angle)
+
+    self.line( origin_x, origin_y, int(round(x)), int(round(y)), col )
 
-      x0+=1
+  def line(self, x0, y0, x1, y1, col=BLACK):
+    for x, y in _line_points(x0, y0, x1, y1):
+      self.pixel(x, y, col)
 
   def test(self):
     out = ''
     for y in range(self.height):
       for x in range(self.width):
-        if self.buffer[(x,y)].rgb() == (0,0,0):
+        if self.get_pixel(x, y) == BLACK:
           out += '  '
         else:
           out += '##'
@@ -155,4 +368,11 @@ if __name__ == '__main__':
   print("Testing circle line")
   g.circle_line(4,4,3,0,Color(255,255,255))
   g.test()
-
+  g.clear()
+  print("Testing filled circle")
+  g.circle(4,4,3,Color(255,255,255),Color(255,0,0))
+  g.test()
+  g.clear()
+  print("Testing filled triangle")
+  g.triangle(0,7,4,0,7,7,Color(255,255,255),Color(255,0,0))
+  g.test()
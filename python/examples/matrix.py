@@ -2,7 +2,6 @@
 
 import unicornhat as unicorn
 from random import randint
-import time
 
 unicorn.brightness(0.20)
 unicorn.rotation(90)
@@ -12,7 +11,9 @@ wrd_rgb = [[154, 173, 154], [0, 255, 0], [0, 200, 0], [0, 162, 0], [0, 145, 0],
 clock = 0
 
 blue_pilled_population = [[randint(0,7), 7]]
-while True:
+
+def draw(step):
+        global clock
         for person in blue_pilled_population:
                 y = person[1]
                 for rgb in wrd_rgb:
@@ -20,8 +21,8 @@ while True:
                                 unicorn.set_pixel(person[0], y, rgb[0], rgb[1], rgb[2])
                         y += 1
                 person[1] -= 1
-        unicorn.show()
-        time.sleep(0.1)
+        # Count drawn frames rather than using step, which
+        # jumps when the loop skips frames
         clock += 1
         if clock % 5 == 0:
                 blue_pilled_population.append([randint(0,7), 7])
@@ -29,3 +30,5 @@ while True:
                 blue_pilled_population.append([randint(0,7), 7])
         while len(blue_pilled_population) > 100:
                 blue_pilled_population.pop(0)
+
+unicorn.run(draw, fps=10)
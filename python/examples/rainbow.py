@@ -11,10 +11,10 @@ print("Pooping rainbows...")
 
 unicorn.brightness(0.1)
 
-i = 0.0
 offset = 30
-while True:
-        i = i + 0.3
+
+def draw(step):
+        i = step * 0.3
         for y in range(8):
                 for x in range(8):
                         r = 0#x * 32
@@ -27,5 +27,5 @@ while True:
                         g = max(0, min(255, g + offset))
                         b = max(0, min(255, b + offset))
                         unicorn.set_pixel(x,y,int(r),int(g),int(b))
-        unicorn.show()
-        time.sleep(0.01)
+
+unicorn.run(draw, fps=100)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+
+'''
+Scrolls a message across UnicornHat, or the time if you don't
+give one, with the unicornhat text marquee.
+
+The message is drawn once into a strip of columns and each
+frame is just the part of the strip on the display.
+
+Usage: sudo python ticker.py ["message"] [speed] [brightness]
+'''
+
+import sys, time
+import unicornhat as unicorn
+from unicornhat import text
+
+speed = float(sys.argv[2]) if len(sys.argv) > 2 else 30
+unicorn.brightness(float(sys.argv[3]) if len(sys.argv) > 3 else 0.2)
+
+try:
+  if len(sys.argv) > 1:
+    text.scroll(sys.argv[1], speed, loops=None, color=(0, 255, 255))
+  else:
+    # Only the time changes, so a new marquee is made for each pass
+    while True:
+      text.scroll(time.strftime('%H:%M:%S'), speed, color=(255, 128, 0))
+except KeyboardInterrupt:
+  pass
@@ -591,9 +591,13 @@ int ws2811_wait(ws2811_t *ws2811)
  * Render the PWM DMA buffer from the user supplied LED arrays and start the DMA
  * controller.  This will update all LEDs on both PWM channels.
  *
+ * Returns as soon as the DMA controller has been started, the LED arrays can be
+ * filled with the next frame while this one is sent out.  Use ws2811_wait() to
+ * wait for the transfer to complete.
+ *
  * @param    ws2811  ws2811 instance pointer.
  *
- * @returns  None
+ * @returns  0 on success, -1 on DMA competion error
  */
 int ws2811_render(ws2811_t *ws2811)
 {
@@ -601,6 +605,13 @@ int ws2811_render(ws2811_t *ws2811)
     int bitpos = 31;
     int i, j, k, l, chan;
 
+    // Wait for any previous DMA operation to complete before the PWM buffer
+    // it is reading from is overwritten.
+    if (ws2811_wait(ws2811))
+    {
+        return -1;
+    }
+
     for (chan = 0; chan < RPI_PWM_CHANNELS; chan++)         // Channel
     {
         ws2811_channel_t *channel = &ws2811->channel[chan];
@@ -656,12 +667,6 @@ int ws2811_render(ws2811_t *ws2811)
         }
     }
 
-    // Wait for any previous DMA operation to complete.
-    if (ws2811_wait(ws2811))
-    {
-        return -1;
-    }
-
     dma_start(ws2811);
 
     return 0;
@@ -1,6 +1,7 @@
 # Adafruit NeoPixel library port to the rpi_ws281x library.
 # Author: Tony DiCola (tony@tonydicola.com), Jeremy Garff (jer@jers.net)
 import _rpi_ws281x as ws
+from array import array
 import atexit
 
 
@@ -15,11 +16,20 @@ def Color(red, green, blue):
 class _LED_Data(object):
 	"""Wrapper class which makes a SWIG LED color data array look and feel like
 	a Python list of integers.
+
+	Slices are copied in and out of the LED array with a single native call.
+	Besides lists of 24-bit colors, a slice can be assigned from any object
+	supporting the buffer protocol: buffers with 4 byte items such as
+	array('I') hold 24-bit colors, while bytes, bytearray and other byte
+	buffers hold packed red, green, blue triplets.
 	"""
 	def __init__(self, channel, size):
 		self.size = size
 		self.channel = channel
 
+	def __len__(self):
+		return self.size
+
 	def __getitem__(self, pos):
 		"""Return the 24-bit RGB color value at the provided position or slice
 		of positions.
@@ -27,7 +37,12 @@ class _LED_Data(object):
 		# Handle if a slice of positions are passed in by grabbing all the values
 		# and returning them in a list.
 		if isinstance(pos, slice):
-			return [ws.ws2811_led_get(self.channel, n) for n in range(pos.indices(self.size))]
+			start, stop, step = pos.indices(self.size)
+			if step != 1:
+				return self[:][start:stop:step]
+			data = array('I', [0]) * max(0, stop - start)
+			self.read(data, start)
+			return data.tolist()
 		# Else assume the passed in value is a number to the position.
 		else:
 			return ws.ws2811_led_get(self.channel, pos)
@@ -39,16 +54,145 @@ class _LED_Data(object):
 		# Handle if a slice of positions are passed in by setting the appropriate
 		# LED data values to the provided values.
 		if isinstance(pos, slice):
-			index = 0
-			for n in range(pos.indices(self.size)):
-				ws.ws2811_led_set(self.channel, n, value[index])
-				index += 1
+			start, stop, step = pos.indices(self.size)
+			if step != 1:
+				# Extended slices are gathered into a full copy of the buffer
+				# so they still only cost one read and one write.
+				data = array('I', self[:])
+				data[start:stop:step] = _as_colors(value)
+				start, stop, value = 0, self.size, data
+			data, count = _as_buffer(value)
+			if count != max(0, stop - start):
+				raise ValueError('LED data size does not match the slice size')
+			_check(ws.ws2811_leds_set(self.channel, start, count, data))
 		# Else assume the passed in value is a number to the position.
 		else:
 			return ws.ws2811_led_set(self.channel, pos, value)
 
+	def write(self, data, start=0):
+		"""Copy LED colors from data into the LED array, starting at position
+		start, in one native call.  Data is a sequence of 24-bit colors or a
+		buffer as described above.
+		"""
+		data, count = _as_buffer(data)
+		_check(ws.ws2811_leds_set(self.channel, start, count, data))
+
+	def read(self, data, start=0):
+		"""Copy LED colors starting at position start into the writable buffer
+		data, an array('I') or a bytearray of packed red, green, blue bytes, in
+		one native call.
+		"""
+		data, count = _as_buffer(data)
+		_check(ws.ws2811_leds_get(self.channel, start, count, data))
+
+
+def _as_buffer(data):
+	"""Return data and the number of LEDs it holds.  Objects without buffer
+	protocol support are treated as sequences of 24-bit colors and packed into
+	an array('I').
+	"""
+	try:
+		view = memoryview(data)
+	except TypeError:
+		data = array('I', data)
+		return data, len(data)
+	nbytes = view.nbytes if hasattr(view, 'nbytes') else len(view.tobytes())
+	return data, nbytes // (4 if view.itemsize == 4 else 3)
+
+
+def _as_colors(data):
+	"""Return data as an array('I') of 24-bit colors."""
+	data, count = _as_buffer(data)
+	raw = memoryview(data).tobytes()
+	if len(raw) == count * 4:
+		colors = array('I')
+		# Python 2 arrays only have fromstring
+		frombytes = getattr(colors, 'frombytes', None) or colors.fromstring
+		frombytes(raw)
+		return colors
+	rgb = bytearray(raw)
+	return array('I', [(rgb[n] << 16) | (rgb[n + 1] << 8) | rgb[n + 2] for n in range(0, len(rgb), 3)])
+
+
+def _check(resp):
+	"""Raise a descriptive error for a failed bulk LED copy."""
+	if resp == -1:
+		raise TypeError('LED data must be a contiguous buffer or a sequence of colors')
+	if resp == -2:
+		raise ValueError('LED data size does not match the number of LEDs')
+	if resp == -3:
+		raise IndexError('LED range is outside of the LED buffer')
 
-class Adafruit_NeoPixel(object):
+
+def _configure(channel, num, pin, invert, brightness):
+	"""Set up a ws2811_channel_t to drive num LEDs from pin."""
+	ws.ws2811_channel_t_count_set(channel, num)
+	ws.ws2811_channel_t_gpionum_set(channel, pin)
+	ws.ws2811_channel_t_invert_set(channel, 0 if not invert else 1)
+	ws.ws2811_channel_t_brightness_set(channel, brightness)
+
+
+class NeoPixelChannel(object):
+	"""One PWM channel of a NeoPixel display, with its own LED buffer, number
+	of pixels and brightness.  Adafruit_NeoPixel is the first channel, and
+	Adafruit_NeoPixel.addChannel() returns the second.  Both channels are
+	sent out together by Adafruit_NeoPixel.show().
+	"""
+	def __init__(self, channel, num):
+		self._channel = channel
+		self._led_data = _LED_Data(channel, num)
+
+	def setPixelColor(self, n, color):
+		"""Set LED at position n to the provided 24-bit color value (in RGB order).
+		"""
+		self._led_data[n] = color
+
+	def setPixelColorRGB(self, n, red, green, blue):
+		"""Set LED at position n to the provided red, green, and blue color.
+		Each color component should be a value from 0 to 255 (where 0 is the
+		lowest intensity and 255 is the highest intensity).
+		"""
+		self.setPixelColor(n, Color(red, green, blue))
+
+	def setBrightness(self, brightness):
+		"""Scale each LED in the buffer by the provided brightness.  A brightness
+		of 0 is the darkest and 255 is the brightest.
+		"""
+		ws.ws2811_channel_t_brightness_set(self._channel, brightness)
+
+	def setPixels(self, data, start=0):
+		"""Set a block of LEDs, starting at position start, from a list of
+		24-bit colors, an array('I') of 24-bit colors or a buffer of packed
+		red, green, blue bytes.  The whole block is copied in one call.
+		"""
+		self._led_data.write(data, start)
+
+	def getPixelsRGB(self, data=None, start=0):
+		"""Copy LED colors, starting at position start, into data as packed
+		red, green, blue bytes in one call.  Data defaults to a new bytearray
+		covering every LED from start onwards, and is returned.
+		"""
+		if data is None:
+			data = bytearray((self._led_data.size - start) * 3)
+		self._led_data.read(data, start)
+		return data
+
+	def getPixels(self):
+		"""Return an object which allows access to the LED display data as if 
+		it were a sequence of 24-bit RGB values.
+		"""
+		return self._led_data
+
+	def numPixels(self):
+		"""Return the number of pixels in the display."""
+		return ws.ws2811_channel_t_count_get(self._channel)
+
+	def getPixelColor(self, n):
+		"""Get the 24-bit RGB color value for the LED at position n."""
+		return self._led_data[n]
+
+
+class Adafruit_NeoPixel(NeoPixelChannel):
 	def __init__(self, num, pin, freq_hz=800000, dma=5, invert=False, brightness=255, channel=0):
 		"""Class to represent a NeoPixel/WS281x LED display.  Num should be the
 		number of pixels in the display, and pin should be the GPIO pin connected
@@ -70,19 +214,16 @@ class Adafruit_NeoPixel(object):
 			ws.ws2811_channel_t_brightness_set(chan, 0)
 
 		# Initialize the channel in use
-		self._channel = ws.ws2811_channel_get(self._leds, channel)
-		ws.ws2811_channel_t_count_set(self._channel, num)
-		ws.ws2811_channel_t_gpionum_set(self._channel, pin)
-		ws.ws2811_channel_t_invert_set(self._channel, 0 if not invert else 1)
-		ws.ws2811_channel_t_brightness_set(self._channel, brightness)
+		self._channel_number = channel
+		self._second = None
+		self._started = False
+		NeoPixelChannel.__init__(self, ws.ws2811_channel_get(self._leds, channel), num)
+		_configure(self._channel, num, pin, invert, brightness)
 
 		# Initialize the controller
 		ws.ws2811_t_freq_set(self._leds, freq_hz)
 		ws.ws2811_t_dmanum_set(self._leds, dma)
 
-		# Grab the led data array.
-		self._led_data = _LED_Data(self._channel, num)
-
 		atexit.register(self._cleanup)
 
 	def _cleanup(self):	
@@ -92,12 +233,34 @@ class Adafruit_NeoPixel(object):
 			ws.delete_ws2811_t(self._leds)
 			self._leds = None
 			self._channel = None
+			if self._second is not None:
+				self._second._channel = None
 			# Note that ws2811_fini will free the memory used by led_data internally.
 
 	def __del__(self):
 		if ws != None:
 			self._cleanup()
 
+	def addChannel(self, num, pin, invert=False, brightness=255):
+		"""Drive a second display of num pixels from the other PWM channel, on
+		pin (GPIO 13 or 19 for channel 1, 12 or 18 for channel 0).  Returns a
+		NeoPixelChannel with its own LED buffer and brightness.  Both channels
+		are rendered by the same call to show(), so they update in lockstep for
+		the cost of a single DMA transfer.  Must be called before begin().
+		"""
+		if self._started:
+			raise RuntimeError('Channels must be added before begin()')
+		if self._second is not None:
+			raise RuntimeError('Both PWM channels are already in use')
+		channel = ws.ws2811_channel_get(self._leds, 1 - self._channel_number)
+		_configure(channel, num, pin, invert, brightness)
+		self._second = NeoPixelChannel(channel, num)
+		return self._second
+
+	def getChannel(self):
+		"""Return the NeoPixelChannel added by addChannel(), or None."""
+		return self._second
+
 	def begin(self):
 		"""Initialize library, must be called once before other functions are
 		called.
@@ -105,41 +268,25 @@ class Adafruit_NeoPixel(object):
 		resp = ws.ws2811_init(self._leds)
 		if resp != 0:
 			raise RuntimeError('ws2811_init failed with code {0}'.format(resp))
-		
-	def show(self):
-		"""Update the display with the data from the LED buffer."""
+		self._started = True
+
+	def show(self, block=True):
+		"""Update the display, and the second channel if one was added, with
+		the data from their LED buffers in a single render.  By default this
+		waits until the whole frame has been sent to the LEDs.  If block is
+		False it returns as soon as the transfer has started, leaving the LED
+		buffer free to be filled with the next frame while the hardware sends out
+		the last one.  The next call to show() or wait() waits for the transfer
+		to finish.
+		"""
 		resp = ws.ws2811_render(self._leds)
 		if resp != 0:
 			raise RuntimeError('ws2811_render failed with code {0}'.format(resp))
+		if block:
+			self.wait()
 
-	def setPixelColor(self, n, color):
-		"""Set LED at position n to the provided 24-bit color value (in RGB order).
-		"""
-		self._led_data[n] = color
-
-	def setPixelColorRGB(self, n, red, green, blue):
-		"""Set LED at position n to the provided red, green, and blue color.
-		Each color component should be a value from 0 to 255 (where 0 is the
-		lowest intensity and 255 is the highest intensity).
-		"""
-		self.setPixelColor(n, Color(red, green, blue))
-
-	def setBrightness(self, brightness):
-		"""Scale each LED in the buffer by the provided brightness.  A brightness
-		of 0 is the darkest and 255 is the brightest.
-		"""
-		ws.ws2811_channel_t_brightness_set(self._channel, brightness)
-
-	def getPixels(self):
-		"""Return an object which allows access to the LED display data as if 
-		it were a sequence of 24-bit RGB values.
-		"""
-		return self._led_data
-
-	def numPixels(self):
-		"""Return the number of pixels in the display."""
-		return ws.ws2811_channel_t_count_get(self._channel)
-
-	def getPixelColor(self, n):
-		"""Get the 24-bit RGB color value for the LED at position n."""
-		return self._led_data[n]
+	def wait(self):
+		"""Wait for the transfer started by the last call to show() to finish."""
+		resp = ws.ws2811_wait(self._leds)
+		if resp != 0:
+			raise RuntimeError('ws2811_wait failed with code {0}'.format(resp))
@@ -45,4 +45,106 @@
     {
         return &ws->channel[channelnum];
     }
+
+    // Copy count LEDs from any contiguous buffer into the channel, starting
+    // at offset, in a single call.  Buffers with 4 byte items (array('I'))
+    // are taken as 0x00RRGGBB words, byte buffers as packed r, g, b
+    // triplets.  Returns 0 on success or a negative error code: -1 if data
+    // is not a contiguous buffer, -2 if it does not hold exactly count LEDs
+    // and -3 if the LEDs fall outside the channel.
+    int ws2811_leds_set(ws2811_channel_t *channel, int offset, int count, PyObject *data)
+    {
+        Py_buffer view;
+        const uint8_t *rgb;
+        int i;
+
+        if (PyObject_GetBuffer(data, &view, PyBUF_C_CONTIGUOUS) != 0)
+        {
+            PyErr_Clear();
+            return -1;
+        }
+
+        if ((view.itemsize == sizeof(ws2811_led_t) && view.len != count * sizeof(ws2811_led_t)) ||
+            (view.itemsize == 1 && view.len != count * 3) ||
+            (view.itemsize != sizeof(ws2811_led_t) && view.itemsize != 1))
+        {
+            PyBuffer_Release(&view);
+            return -2;
+        }
+
+        if (offset < 0 || offset + count > channel->count)
+        {
+            PyBuffer_Release(&view);
+            return -3;
+        }
+
+        if (view.itemsize == sizeof(ws2811_led_t))
+        {
+            memcpy(&channel->leds[offset], view.buf, count * sizeof(ws2811_led_t));
+        }
+        else
+        {
+            rgb = (const uint8_t *)view.buf;
+
+            for (i = 0; i < count; i++, rgb += 3)
+            {
+                channel->leds[offset + i] = (rgb[0] << 16) | (rgb[1] << 8) | rgb[2];
+            }
+        }
+
+        PyBuffer_Release(&view);
+
+        return 0;
+    }
+
+    // Copy count LEDs out of the channel, starting at offset, into a
+    // writable buffer using the same rules and errors as ws2811_leds_set.
+    int ws2811_leds_get(ws2811_channel_t *channel, int offset, int count, PyObject *data)
+    {
+        Py_buffer view;
+        uint8_t *rgb;
+        int i;
+
+        if (PyObject_GetBuffer(data, &view, PyBUF_C_CONTIGUOUS | PyBUF_WRITABLE) != 0)
+        {
+            PyErr_Clear();
+            return -1;
+        }
+
+        if ((view.itemsize == sizeof(ws2811_led_t) && view.len != count * sizeof(ws2811_led_t)) ||
+            (view.itemsize == 1 && view.len != count * 3) ||
+            (view.itemsize != sizeof(ws2811_led_t) && view.itemsize != 1))
+        {
+            PyBuffer_Release(&view);
+            return -2;
+        }
+
+        if (offset < 0 || offset + count > channel->count)
+        {
+            PyBuffer_Release(&view);
+            return -3;
+        }
+
+        if (view.itemsize == sizeof(ws2811_led_t))
+        {
+            memcpy(view.buf, &channel->leds[offset], count * sizeof(ws2811_led_t));
+        }
+        else
+        {
+            rgb = (uint8_t *)view.buf;
+
+            for (i = 0; i < count; i++, rgb += 3)
+            {
+                ws2811_led_t color = channel->leds[offset + i];
+
+                rgb[0] = (color >> 16) & 0xff;
+                rgb[1] = (color >> 8) & 0xff;
+                rgb[2] = color & 0xff;
+            }
+        }
+
+        PyBuffer_Release(&view);
+
+        return 0;
+    }
 %}
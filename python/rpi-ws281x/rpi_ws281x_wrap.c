@@ -3225,6 +3225,108 @@ SWIGINTERNINLINE PyObject*
         return &ws->channel[channelnum];
     }
 
+    // Copy count LEDs from any contiguous buffer into the channel, starting
+    // at offset, in a single call.  Buffers with 4 byte items (array('I'))
+    // are taken as 0x00RRGGBB words, byte buffers as packed r, g, b
+    // triplets.  Returns 0 on success or a negative error code: -1 if data
+    // is not a contiguous buffer, -2 if it does not hold exactly count LEDs
+    // and -3 if the LEDs fall outside the channel.
+    int ws2811_leds_set(ws2811_channel_t *channel, int offset, int count, PyObject *data)
+    {
+        Py_buffer view;
+        const uint8_t *rgb;
+        int i;
+
+        if (PyObject_GetBuffer(data, &view, PyBUF_C_CONTIGUOUS) != 0)
+        {
+            PyErr_Clear();
+            return -1;
+        }
+
+        if ((view.itemsize == sizeof(ws2811_led_t) && view.len != count * sizeof(ws2811_led_t)) ||
+            (view.itemsize == 1 && view.len != count * 3) ||
+            (view.itemsize != sizeof(ws2811_led_t) && view.itemsize != 1))
+        {
+            PyBuffer_Release(&view);
+            return -2;
+        }
+
+        if (offset < 0 || offset + count > channel->count)
+        {
+            PyBuffer_Release(&view);
+            return -3;
+        }
+
+        if (view.itemsize == sizeof(ws2811_led_t))
+        {
+            memcpy(&channel->leds[offset], view.buf, count * sizeof(ws2811_led_t));
+        }
+        else
+        {
+            rgb = (const uint8_t *)view.buf;
+
+            for (i = 0; i < count; i++, rgb += 3)
+            {
+                channel->leds[offset + i] = (rgb[0] << 16) | (rgb[1] << 8) | rgb[2];
+            }
+        }
+
+        PyBuffer_Release(&view);
+
+        return 0;
+    }
+
+    // Copy count LEDs out of the channel, starting at offset, into a
+    // writable buffer using the same rules and errors as ws2811_leds_set.
+    int ws2811_leds_get(ws2811_channel_t *channel, int offset, int count, PyObject *data)
+    {
+        Py_buffer view;
+        uint8_t *rgb;
+        int i;
+
+        if (PyObject_GetBuffer(data, &view, PyBUF_C_CONTIGUOUS | PyBUF_WRITABLE) != 0)
+        {
+            PyErr_Clear();
+            return -1;
+        }
+
+        if ((view.itemsize == sizeof(ws2811_led_t) && view.len != count * sizeof(ws2811_led_t)) ||
+            (view.itemsize == 1 && view.len != count * 3) ||
+            (view.itemsize != sizeof(ws2811_led_t) && view.itemsize != 1))
+        {
+            PyBuffer_Release(&view);
+            return -2;
+        }
+
+        if (offset < 0 || offset + count > channel->count)
+        {
+            PyBuffer_Release(&view);
+            return -3;
+        }
+
+        if (view.itemsize == sizeof(ws2811_led_t))
+        {
+            memcpy(view.buf, &channel->leds[offset], count * sizeof(ws2811_led_t));
+        }
+        else
+        {
+            rgb = (uint8_t *)view.buf;
+
+            for (i = 0; i < count; i++, rgb += 3)
+            {
+                ws2811_led_t color = channel->leds[offset + i];
+
+                rgb[0] = (color >> 16) & 0xff;
+                rgb[1] = (color >> 8) & 0xff;
+                rgb[2] = color & 0xff;
+            }
+        }
+
+        PyBuffer_Release(&view);
+
+        return 0;
+    }
+
 #ifdef __cplusplus
 extern "C" {
 #endif
@@ -3974,6 +4076,92 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_ws2811_leds_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ws2811_channel_t *arg1 = (ws2811_channel_t *) 0 ;
+  int arg2 ;
+  int arg3 ;
+  PyObject *arg4 = (PyObject *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  int val3 ;
+  int ecode3 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  PyObject * obj3 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOOO:ws2811_leds_set",&obj0,&obj1,&obj2,&obj3)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ws2811_channel_t, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_leds_set" "', argument " "1"" of type '" "ws2811_channel_t *""'"); 
+  }
+  arg1 = (ws2811_channel_t *)(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "ws2811_leds_set" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = (int)(val2);
+  ecode3 = SWIG_AsVal_int(obj2, &val3);
+  if (!SWIG_IsOK(ecode3)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode3), "in method '" "ws2811_leds_set" "', argument " "3"" of type '" "int""'");
+  } 
+  arg3 = (int)(val3);
+  arg4 = obj3;
+  result = (int)ws2811_leds_set(arg1,arg2,arg3,arg4);
+  resultobj = SWIG_From_int((int)(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ws2811_leds_get(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ws2811_channel_t *arg1 = (ws2811_channel_t *) 0 ;
+  int arg2 ;
+  int arg3 ;
+  PyObject *arg4 = (PyObject *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  int val3 ;
+  int ecode3 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  PyObject * obj3 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOOO:ws2811_leds_get",&obj0,&obj1,&obj2,&obj3)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ws2811_channel_t, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_leds_get" "', argument " "1"" of type '" "ws2811_channel_t *""'"); 
+  }
+  arg1 = (ws2811_channel_t *)(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "ws2811_leds_get" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = (int)(val2);
+  ecode3 = SWIG_AsVal_int(obj2, &val3);
+  if (!SWIG_IsOK(ecode3)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode3), "in method '" "ws2811_leds_get" "', argument " "3"" of type '" "int""'");
+  } 
+  arg3 = (int)(val3);
+  arg4 = obj3;
+  result = (int)ws2811_leds_get(arg1,arg2,arg3,arg4);
+  resultobj = SWIG_From_int((int)(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 static PyMethodDef SwigMethods[] = {
 	 { (char *)"SWIG_PyInstanceMethod_New", (PyCFunction)SWIG_PyInstanceMethod_New, METH_O, NULL},
 	 { (char *)"ws2811_channel_t_gpionum_set", _wrap_ws2811_channel_t_gpionum_set, METH_VARARGS, NULL},
@@ -4007,6 +4195,8 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"ws2811_led_get", _wrap_ws2811_led_get, METH_VARARGS, NULL},
 	 { (char *)"ws2811_led_set", _wrap_ws2811_led_set, METH_VARARGS, NULL},
 	 { (char *)"ws2811_channel_get", _wrap_ws2811_channel_get, METH_VARARGS, NULL},
+	 { (char *)"ws2811_leds_set", _wrap_ws2811_leds_set, METH_VARARGS, NULL},
+	 { (char *)"ws2811_leds_get", _wrap_ws2811_leds_get, METH_VARARGS, NULL},
 	 { NULL, NULL, 0, NULL }
 };
 
@@ -1,52 +1,155 @@
-import socket, atexit, time
+import socket, atexit, time, struct, threading, binascii
 
 sck = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 
-print('Unicorn Started')
-
 connected = False
 
 port = 7676
 
-pixels = ['000000'] * 64
+'''
+Frames are sent to the emulator using its binary
+protocol, a header followed by r, g, b bytes for
+every pixel row by row. Call protocol('text') to
+fall back to comma separated hex colours.
+'''
+MAGIC = b'\xffU'
+HEADER = struct.Struct('!2sBH')
+CMD_FRAME = 0
+CMD_CLEAR = 1
+CMD_STOP  = 2
+
+_protocol = 'binary'
+
+'''
+The frame is kept ready to send, the binary header
+followed by the pixels, set_pixel writes straight
+into it after the header.
+'''
+packet = bytearray(HEADER.pack(MAGIC, CMD_FRAME, 64 * 3)) + bytearray(64 * 3)
+frame = memoryview(packet)[HEADER.size:]
+
+'''
+show() hands frames to a background sender. If the
+emulator falls behind only the newest frame waits to
+be sent and older ones are dropped. If sending fails
+the error is kept and raised by the next show().
+'''
+_pending = None
+_running = True
+_error = None
+_ready = threading.Condition()
+frames_sent = 0
+frames_dropped = 0
 
 attempt = 0
 
 while not connected:
 	try:
 		time.sleep(0.5)
-		print('Trying port',port + attempt)
 		sck.connect(('127.0.0.1',port + attempt))
 		connected = True
-		print('Connected',port + attempt)
 	except:
 		if attempt >= 10:
 			exit("Unable to connect to UnicornHat Emulator")
 		attempt += 1
 
+def sender():
+	global _pending, _error, frames_sent
+	while True:
+		with _ready:
+			while _pending == None and _running:
+				_ready.wait()
+			data = _pending
+			_pending = None
+			# Let flush() know the frame has been taken
+			_ready.notify_all()
+		if data == None:
+			return
+		try:
+			sck.sendall(data)
+		except socket.error as error:
+			with _ready:
+				_error = error
+				_ready.notify_all()
+			return
+		frames_sent += 1
+
+_sender = threading.Thread(target=sender)
+_sender.daemon = True
+_sender.start()
+
 def close():
-	send('stop')
-	sck.shutdown(socket.SHUT_RDWR)
+	global _running
+	with _ready:
+		_running = False
+		_ready.notify_all()
+	_sender.join()
+	# The emulator may already have gone, there's nothing
+	# more to do about it while exiting
+	try:
+		if _protocol == 'binary':
+			sck.sendall(HEADER.pack(MAGIC, CMD_STOP, 0))
+		else:
+			sck.sendall(b'stop\n')
+		sck.shutdown(socket.SHUT_RDWR)
+	except socket.error:
+		pass
 	sck.close()
 
 atexit.register(close)
 
-def send(cmd):
-	print(cmd);
-	sck.send(cmd + '\n')
+def protocol(name='binary'):
+	global _protocol
+	'''
+	Set the protocol used to talk to the emulator,
+	either binary or text
+	'''
+	if name not in ['binary', 'text']:
+		raise ValueError('Protocol must be binary or text')
+	_protocol = name
 
-def clear():
-	send('clear')
+def send(data):
+	global _pending, frames_dropped
+	'''
+	Queue data for the sender, replacing
+	anything it hasn't sent yet
+	'''
+	with _ready:
+		if _error != None:
+			raise _error
+		if _pending != None:
+			frames_dropped += 1
+		_pending = data
+		_ready.notify_all()
 
-def set_pixel(x, y, r, g, b):
+def flush():
+	'''
+	Wait until the sender has taken the last frame
+	'''
+	with _ready:
+		while _pending != None and _error == None:
+			_ready.wait()
+		if _error != None:
+			raise _error
 
-	r = hex(r)[2:].zfill(2)
-	g = hex(g)[2:].zfill(2)
-	b = hex(b)[2:].zfill(2)
+def get_frame_stats():
+	'''
+	Get the number of frames sent to the emulator and the
+	number dropped because a newer frame replaced them
+	'''
+	return {'sent': frames_sent, 'dropped': frames_dropped}
 
-	pixels[(x*8) + y] = ''.join([r,g,b])
-	#send( ','.join([str(x),str(y),str(r),str(g),str(b)]) )
+def clear():
+	frame[:] = bytes(bytearray(len(frame)))
+	show()
+
+def set_pixel(x, y, r, g, b):
+	index = ((y * 8) + x) * 3
+	frame[index:index + 3] = bytes(bytearray((r, g, b)))
 
 def show():
-	#send('show')
-	send(','.join(pixels))
+	if _protocol == 'binary':
+		send(bytes(packet))
+	else:
+		pixels = binascii.hexlify(frame.tobytes())
+		send(b','.join([pixels[index:index + 6] for index in range(0, len(pixels), 6)]) + b'\n')
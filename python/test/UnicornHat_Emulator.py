@@ -1,7 +1,19 @@
 #!/usr/bin/env python
-from Tkinter import *
-import threading, time, Queue
-import signal, socket
+try:
+	import Queue
+except ImportError:
+	import queue as Queue
+try:
+	from Tkinter import *
+except ImportError:
+	try:
+		from tkinter import *
+	except ImportError:
+		# Without Tk only --headless can be used
+		Tk = None
+		Frame = object
+import threading, time
+import argparse, binascii, signal, socket, struct, sys, zlib
 
 PIXELS_X = 8
 PIXELS_Y = 8
@@ -13,6 +25,22 @@ BORDER  = 10
 DISPLAY_W = ((PIXEL_W + PIXEL_SPACING) * PIXELS_X) - PIXEL_SPACING + (BORDER * 2)
 DISPLAY_H = ((PIXEL_H + PIXEL_SPACING) * PIXELS_Y) - PIXEL_SPACING + (BORDER * 2)
 
+## Binary protocol
+#
+#  Every binary message starts with a header of the two magic
+#  bytes, a command and the length of the payload that follows.
+#  Frame payloads are r, g, b bytes for every pixel, row by row.
+#  The first magic byte can never start a line of the text
+#  protocol, so both can be used on the same connection.
+MAGIC = b'\xffU'
+MAGIC_START = 0xff
+HEADER = struct.Struct('!2sBH')
+CMD_FRAME = 0
+CMD_CLEAR = 1
+CMD_STOP  = 2
+
+FRAME_SIZE = PIXELS_X * PIXELS_Y * 3
+
 window = None
 display = None
 
@@ -22,6 +50,8 @@ class Display(Frame):
 		self.canvas = None
 		self.buffer = {}
 		self.pixels = {}
+		self.colours = ['#000000'] * (PIXELS_X * PIXELS_Y)
+		self.paints = 0
 		self.pack()
 		self.init_display()
 
@@ -36,31 +66,71 @@ class Display(Frame):
 				self.buffer[ (x,y) ] = [0,0,0]
 				self.pixels[ (x,y) ] = self.canvas.create_rectangle(pixel_x, pixel_y, pixel_x + PIXEL_W, pixel_y + PIXEL_H, fill='black', width=0)
 
+	def paint(self, colours):
+		# Draw a list of '#rrggbb' colours, row by row, only
+		# touching the rectangles whose colour has changed
+		for idx, colour in enumerate(colours):
+			if colour != self.colours[idx]:
+				self.canvas.itemconfigure(self.pixels[(idx % PIXELS_X, idx // PIXELS_X)], fill=colour)
+		self.colours = colours
+		self.paints += 1
+
 	def set_pixel(self,x, y, r, g, b):
 		self.buffer[ (x,y) ] = [r,g,b]
 
-	def clear():
+	def clear(self):
 		# Clear the display
-		for x in range(8):
-			for x in range(8):
+		for x in range(PIXELS_X):
+			for y in range(PIXELS_Y):
 				self.set_pixel(x,y,0,0,0)
-				self.show()
+		self.show()
 
 	def show_q(self, pixels):
-		x = 0
-		for idx,pixel in enumerate(pixels):
-			x = idx % 8
-			y = int(idx / 8)
-			self.canvas.itemconfigure(self.pixels[(x,y)], fill= '#' + pixel)
-			x+=1
+		self.paint(['#' + pixel for pixel in pixels])
+
+	def show_frame(self, frame):
+		# Show a binary frame of r, g, b bytes, row by row
+		pixels = binascii.hexlify(frame).decode('ascii')
+		self.paint(['#' + pixels[idx:idx + 6] for idx in range(0, len(pixels), 6)])
 
 	def show(self):
-		for position, colour in self.buffer.iteritems():
-			pixel = self.pixels[ position ]
-			r = hex(colour[0])[2:].zfill(2)
-			g = hex(colour[1])[2:].zfill(2)
-			b = hex(colour[2])[2:].zfill(2)
-			self.canvas.itemconfigure(pixel, fill= '#' + r + g + b)
+		colours = []
+		for y in range(PIXELS_Y):
+			for x in range(PIXELS_X):
+				colours.append('#{0:02x}{1:02x}{2:02x}'.format(*self.buffer[ (x,y) ]))
+		self.paint(colours)
+
+## Image backed display
+#
+#  Draws each frame into an 8x8 PhotoImage and zooms it by
+#  scale into the image shown on screen, two Tk calls per
+#  frame whatever the size of the window.
+class ImageDisplay(Display):
+	def __init__(self, master=None, scale=20):
+		self.scale = scale
+		Display.__init__(self, master)
+
+	def init_display(self):
+		self.image = PhotoImage(width=PIXELS_X, height=PIXELS_Y)
+		self.zoomed = PhotoImage(width=PIXELS_X * self.scale, height=PIXELS_Y * self.scale)
+		self.image.put('black', to=(0, 0, PIXELS_X, PIXELS_Y))
+		self.zoomed.put('black', to=(0, 0, PIXELS_X * self.scale, PIXELS_Y * self.scale))
+		self.label = Label(self.master, image=self.zoomed, borderwidth=0)
+		self.label.pack()
+
+		for x in range(PIXELS_X):
+			for y in range(PIXELS_Y):
+				self.buffer[ (x,y) ] = [0,0,0]
+
+	def paint(self, colours):
+		if colours != self.colours:
+			rows = []
+			for y in range(PIXELS_Y):
+				rows.append('{' + ' '.join(colours[y * PIXELS_X:(y + 1) * PIXELS_X]) + '}')
+			self.image.put(' '.join(rows))
+			self.zoomed.tk.call(self.zoomed, 'copy', self.image, '-zoom', self.scale, self.scale)
+			self.colours = colours
+		self.paints += 1
 
 
 queue = Queue.Queue()
@@ -73,15 +143,15 @@ class StoppableThread(threading.Thread):
 	def __init__(self):
 		threading.Thread.__init__(self)
 		self.stop_event = threading.Event()
-		self.daemon = True         
+		self.daemon = True
 
 	def start(self):
-		if self.isAlive() == False:
+		if self.is_alive() == False:
 			self.stop_event.clear()
 			threading.Thread.start(self)
 
 	def stop(self):
-		if self.isAlive() == True:
+		if self.is_alive() == True:
 			# set event to signal thread to terminate
 			self.stop_event.set()
 			# block calling thread until thread really has terminated
@@ -103,76 +173,433 @@ class AsyncWorker(StoppableThread):
 				self.stop_event.set()
 				break
 
-def tcp():
-	global buf, queue, client
+## Client connection reader
+#
+#  Reads from the socket with recv_into straight into a
+#  preallocated buffer and splits out binary messages and
+#  lines of the text protocol as they become complete.
+class Connection(object):
+	def __init__(self, sck, size=65536):
+		self.sck = sck
+		self.buf = bytearray(size)
+		self.view = memoryview(self.buf)
+		self.start = 0
+		self.end = 0
 
-	if client == None:
-		try:
-			client = sck.accept()
-		except:
-			pass
+	def read(self):
+		# Read whatever is waiting, returns False once the client has gone
+		if self.start == self.end:
+			self.start = self.end = 0
+		elif self.end == len(self.buf):
+			# Move the incomplete message to the front to make room
+			length = self.end - self.start
+			self.buf[:length] = self.buf[self.start:self.end]
+			self.start, self.end = 0, length
+		if self.end == len(self.buf):
+			# One message fills the buffer, grow it to fit the rest
+			buf = bytearray(len(self.buf) * 2)
+			buf[:self.end] = self.buf[:self.end]
+			self.buf = buf
+			self.view = memoryview(buf)
+		size = len(self.buf) - self.end
+		count = self.sck.recv_into(self.view[self.end:], size)
+		self.end += count
+		return count > 0 or size == 0
+
+	def messages(self):
+		# Yield (command, payload) for every complete message in the buffer
+		while self.start < self.end:
+			if self.buf[self.start] == MAGIC_START:
+				if self.end - self.start < HEADER.size:
+					return
+				magic, command, length = HEADER.unpack_from(self.buf, self.start)
+				if self.end - self.start < HEADER.size + length:
+					return
+				payload_start = self.start + HEADER.size
+				self.start = payload_start + length
+				if command == CMD_FRAME:
+					yield 'frame', bytes(self.buf[payload_start:self.start])
+				elif command == CMD_CLEAR:
+					yield 'clear', None
+				elif command == CMD_STOP:
+					yield 'stop', None
+			else:
+				newline = self.buf.find(b'\n', self.start, self.end)
+				if newline == -1:
+					return
+				message = self.buf[self.start:newline].decode('ascii', 'replace').strip()
+				self.start = newline + 1
+				if message in ['stop', 'clear', 'show']:
+					yield message, None
+				elif message:
+					yield 'pixels', message.split(',')
+
+## Emulator TCP server
+#
+#  Binds to the first free port from 7676 upwards and passes
+#  each (command, payload) message received to on_message
+#  from a background thread. on_close is called when a
+#  client disconnects or sends stop.
+class EmulatorServer(object):
+	def __init__(self, on_message, port=7676, on_close=None):
+		self.on_message = on_message
+		self.on_close = on_close
+		self.client = None
+		self.sck = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+		self.sck.settimeout(0.1)
+		bound = False
+		while not bound:
+			try:
+				self.sck.bind(('127.0.0.1',port))
+				bound = True
+				print("Bound to",port)
+			except socket.error:
+				port+=1
+		self.port = port
+		self.sck.listen(50)
+		self.worker = AsyncWorker(self.tcp)
+
+	def start(self):
+		self.worker.start()
+
+	def stop(self):
+		self.worker.stop()
+		self.sck.close()
+
+	def tcp(self):
+		if self.client == None:
+			try:
+				client, address = self.sck.accept()
+				client.settimeout(0.1)
+				self.client = Connection(client)
+			except socket.timeout:
+				pass
+			return True
 
-	if client != None:
-		char = None
 		try:
-			char = client[0].recv(1)
-		except:
-			pass
-		if char != None:
-			if char == '\n':
-				message = ''.join(buf).strip()
-				if message == 'stop':
-					client = None
+			connected = self.client.read()
+		except socket.timeout:
+			return True
+		except socket.error:
+			connected = False
+
+		for command, payload in self.client.messages():
+			if command == 'stop':
+				connected = False
+				break
+			self.on_message(command, payload)
+
+		if not connected:
+			self.client.sck.close()
+			self.client = None
+			if self.on_close != None:
+				self.on_close()
+
+		return True
+
+## Headless recorders
+#
+#  Used by --headless to record frames to a file instead of
+#  drawing them. add() is called with every recorded frame,
+#  FRAME_SIZE r, g, b bytes row by row, and close() writes
+#  out whatever the recorder has kept.
+BLACK_FRAME = bytes(bytearray(FRAME_SIZE))
+
+LOG_MAGIC = b'UHFL'
+LOG_HEADER = struct.Struct('!4sBB')
+
+class FrameLog(object):
+	# Raw frame log, a small header giving the size of the
+	# display followed by every frame back to back
+	def __init__(self, path):
+		self.file = open(path, 'wb')
+		self.file.write(LOG_HEADER.pack(LOG_MAGIC, PIXELS_X, PIXELS_Y))
+
+	def add(self, frame):
+		self.file.write(frame)
+
+	def close(self):
+		self.file.close()
+
+def read_frame_log(path):
+	# Yield each frame stored in a log written by FrameLog
+	with open(path, 'rb') as log:
+		magic, width, height = LOG_HEADER.unpack(log.read(LOG_HEADER.size))
+		if magic != LOG_MAGIC:
+			raise ValueError('{0} is not a frame log'.format(path))
+		size = width * height * 3
+		frame = log.read(size)
+		while len(frame) == size:
+			yield frame
+			frame = log.read(size)
+
+def png_chunk(kind, data):
+	return struct.pack('!I', len(data)) + kind + data + struct.pack('!I', zlib.crc32(kind + data) & 0xffffffff)
+
+def png_header(width, height):
+	# PNG signature and IHDR for an 8 bit RGB image
+	return b'\x89PNG\r\n\x1a\n' + png_chunk(b'IHDR', struct.pack('!IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+def scale_frame(frame, scale):
+	# Turn a frame into PNG scanlines, each pixel scale x scale
+	rows = []
+	for y in range(PIXELS_Y):
+		row = frame[y * PIXELS_X * 3:(y + 1) * PIXELS_X * 3]
+		line = b''.join([row[x * 3:x * 3 + 3] * scale for x in range(PIXELS_X)])
+		rows.extend([line] * scale)
+	return rows
+
+def png_data(rows):
+	# Compressed image data, every scanline with filter type 0
+	return zlib.compress(b''.join([b'\x00' + row for row in rows]), 9)
+
+class FrameStore(object):
+	# Keeps frames in memory until close(), identical frames
+	# in a row are stored once with a count
+	def __init__(self, path, scale):
+		self.path = path
+		self.scale = scale
+		self.frames = []
+		self.counts = []
+
+	def add(self, frame):
+		if self.frames and self.frames[-1] == frame:
+			self.counts[-1] += 1
+		else:
+			self.frames.append(frame)
+			self.counts.append(1)
+
+	def close(self):
+		if self.frames:
+			self.save()
+
+class ContactSheet(FrameStore):
+	# Every stored frame side by side in a single PNG
+	def __init__(self, path, scale, columns=16, gap=None):
+		FrameStore.__init__(self, path, scale)
+		self.columns = columns
+		self.gap = gap if gap != None else max(1, scale // 2)
+
+	def add(self, frame):
+		# Keep repeated frames, a sheet shows every frame recorded
+		self.frames.append(frame)
+		self.counts.append(1)
+
+	def save(self):
+		tile_w = PIXELS_X * self.scale
+		tile_h = PIXELS_Y * self.scale
+		columns = min(self.columns, len(self.frames))
+		rows = (len(self.frames) + columns - 1) // columns
+		width = columns * (tile_w + self.gap) + self.gap
+		height = rows * (tile_h + self.gap) + self.gap
+		background = b'\x40\x40\x40'
+		blank = background * tile_w
+		gap_row = background * width
+		gap = background * self.gap
+
+		lines = []
+		for row in range(rows):
+			lines.extend([gap_row] * self.gap)
+			tiles = [scale_frame(frame, self.scale) for frame in self.frames[row * columns:(row + 1) * columns]]
+			tiles.extend([[blank] * tile_h] * (columns - len(tiles)))
+			for y in range(tile_h):
+				lines.append(gap + gap.join([tile[y] for tile in tiles]) + gap)
+		lines.extend([gap_row] * self.gap)
+
+		with open(self.path, 'wb') as png:
+			png.write(png_header(width, height))
+			png.write(png_chunk(b'IDAT', png_data(lines)))
+			png.write(png_chunk(b'IEND', b''))
+
+class APNGWriter(FrameStore):
+	# Animated PNG, each frame shown for 1/fps of a second
+	def __init__(self, path, scale, fps=30):
+		FrameStore.__init__(self, path, scale)
+		self.fps = fps
+
+	def save(self):
+		width = PIXELS_X * self.scale
+		height = PIXELS_Y * self.scale
+		sequence = 0
+		with open(self.path, 'wb') as png:
+			png.write(png_header(width, height))
+			png.write(png_chunk(b'acTL', struct.pack('!II', len(self.frames), 0)))
+			for idx, frame in enumerate(self.frames):
+				png.write(png_chunk(b'fcTL', struct.pack('!IIIIIHHBB', sequence, width, height, 0, 0, self.counts[idx], self.fps, 0, 0)))
+				sequence += 1
+				data = png_data(scale_frame(frame, self.scale))
+				if idx == 0:
+					png.write(png_chunk(b'IDAT', data))
 				else:
-					queue.put(message)
-				buf = []
-			else:
-				buf.append(char)
+					png.write(png_chunk(b'fdAT', struct.pack('!I', sequence) + data))
+					sequence += 1
+			png.write(png_chunk(b'IEND', b''))
 
-	return True
+class GIFWriter(FrameStore):
+	# Animated GIF, needs Pillow to encode the frames
+	def __init__(self, path, scale, fps=30):
+		try:
+			from PIL import Image
+		except ImportError:
+			raise ImportError('Writing GIF files requires Pillow, install with: pip install Pillow')
+		self.Image = Image
+		FrameStore.__init__(self, path, scale)
+		self.fps = fps
 
-buf = []
-client = None
-window = Tk()
-display = Display(window)
+	def save(self):
+		size = (PIXELS_X * self.scale, PIXELS_Y * self.scale)
+		images = [self.Image.frombytes('RGB', (PIXELS_X, PIXELS_Y), frame).resize(size, self.Image.NEAREST) for frame in self.frames]
+		durations = [int(round(count * 1000.0 / self.fps)) for count in self.counts]
+		images[0].save(self.path, save_all=True, append_images=images[1:], duration=durations, loop=0)
 
+def recorder(path, scale, fps):
+	# Pick a recorder from the file extension
+	extension = path.rsplit('.', 1)[-1].lower()
+	if extension == 'png':
+		return ContactSheet(path, scale)
+	elif extension == 'apng':
+		return APNGWriter(path, scale, fps)
+	elif extension == 'gif':
+		return GIFWriter(path, scale, fps)
+	return FrameLog(path)
+
+## Headless emulator
+#
+#  Turns the messages received by the server into frames and
+#  hands every nth frame to the recorders, straight from the
+#  server thread so nothing is dropped and the client runs as
+#  fast as it can send.
+class Headless(object):
+	def __init__(self, recorders, every=1, limit=None):
+		self.recorders = recorders
+		self.every = every
+		self.limit = limit
+		self.frame = BLACK_FRAME
+		self.frames = 0
+		self.recorded = 0
+		self.start = None
+		self.done = threading.Event()
+
+	def on_message(self, command, payload):
+		if command == 'frame':
+			if len(payload) != FRAME_SIZE:
+				return
+			self.frame = payload
+		elif command == 'pixels':
+			try:
+				frame = binascii.unhexlify(''.join(payload))
+			except (TypeError, ValueError):
+				return
+			if len(frame) != FRAME_SIZE:
+				return
+			self.frame = frame
+		elif command == 'clear':
+			self.frame = BLACK_FRAME
+
+		if self.start == None:
+			self.start = time.time()
+		if self.frames % self.every == 0:
+			for recorder in self.recorders:
+				recorder.add(self.frame)
+			self.recorded += 1
+		self.frames += 1
+		if self.limit != None and self.frames >= self.limit:
+			self.done.set()
+
+	def on_close(self):
+		self.done.set()
+
+	def close(self):
+		for recorder in self.recorders:
+			recorder.close()
+
+	def rate(self):
+		if self.start == None:
+			return 0.0
+		return self.frames / max(time.time() - self.start, 1e-9)
+
+def run_headless(args):
+	recorders = [recorder(path, args.scale or 4, args.fps) for path in args.output]
+	headless = Headless(recorders, args.every, args.frames)
+	server = EmulatorServer(headless.on_message, on_close=headless.on_close)
+	server.start()
+	try:
+		while not headless.done.wait(0.1):
+			pass
+	except KeyboardInterrupt:
+		pass
+	rate = headless.rate()
+	server.stop()
+	headless.close()
+	print('Received {0} frames at {1:.1f} fps, recorded {2}'.format(headless.frames, rate, headless.recorded))
 
 def processqueue():
+	# Only the most recent message is worth drawing
+	message = None
 	try:
-		message = None
-		while queue.qsize() > 1:
+		while True:
 			message = queue.get_nowait()
-
-		if message != None:
-			if message == 'show':
-				display.show()
-			elif message == 'clear':
-				display.clear()
-			else:
-				message = message.split(',')
-				display.show_q(message)
-			##display.set_pixel(int(message[0]),int(message[1]),int(message[2]),int(message[3]),int(message[4]))
 	except Queue.Empty:
 		pass
+
+	if message != None:
+		command, payload = message
+		if command == 'show':
+			display.show()
+		elif command == 'clear':
+			display.clear()
+		elif command == 'frame':
+			display.show_frame(payload)
+		elif command == 'pixels':
+			display.show_q(payload)
 	window.after(5, processqueue)
 
-window.after(5, processqueue)
+def report_rate(last_paints=0, last_time=None):
+	# Show the paint rate in the title bar once a second
+	now = time.time()
+	if last_time != None:
+		rate = (display.paints - last_paints) / (now - last_time)
+		window.title('UnicornHat Emulator - {0:.1f} fps'.format(rate))
+	window.after(1000, report_rate, display.paints, now)
 
-sck = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-sck.settimeout(0)
-port = 7676
-bound = False
-while not bound:
-	try:
-		sck.bind(('127.0.0.1',port))
-		bound = True
-		print("Bound to",port)
-	except socket.error:
-		port+=1
+def main():
+	global window, display
+
+	parser = argparse.ArgumentParser(description='UnicornHat Emulator')
+	parser.add_argument('--renderer', choices=['canvas', 'image'], default='canvas', help='draw pixels as canvas rectangles or into a single image')
+	parser.add_argument('--scale', type=int, default=None, help='size of each pixel in the image renderer (default 20) or in headless output (default 4)')
+	parser.add_argument('--headless', action='store_true', help='record frames to files instead of opening a window, exits when the client disconnects')
+	parser.add_argument('--output', action='append', default=[], help='headless output file: .png contact sheet, .apng or .gif animation, anything else a raw frame log, can be given more than once')
+	parser.add_argument('--every', type=int, default=1, help='only record every nth frame in headless mode')
+	parser.add_argument('--frames', type=int, default=None, help='exit headless mode after this many frames')
+	parser.add_argument('--fps', type=int, default=30, help='playback speed of .apng and .gif output')
+	args = parser.parse_args()
+
+	if args.headless:
+		if args.every < 1:
+			parser.error('--every must be at least 1')
+		try:
+			run_headless(args)
+		except ImportError as error:
+			parser.error(str(error))
+		return
+
+	if Tk == None:
+		parser.error('Tk is not available, use --headless')
+
+	window = Tk()
+	window.title('UnicornHat Emulator')
+	if args.renderer == 'image':
+		display = ImageDisplay(window, args.scale or 20)
+	else:
+		display = Display(window)
+	window.after(5, processqueue)
+	report_rate()
 
-sck.listen(50)
+	server = EmulatorServer(lambda command, payload: queue.put((command, payload)))
+	server.start()
 
-t_setup = AsyncWorker(tcp)
-t_setup.start()
+	display.mainloop()
 
-display.mainloop()
+if __name__ == '__main__':
+	main()
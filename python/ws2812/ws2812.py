@@ -6,82 +6,21 @@
 
 
 
-from sys import version_info
-if version_info >= (2,6,0):
-    def swig_import_helper():
-        from os.path import dirname
-        import imp
-        fp = None
-        try:
-            fp, pathname, description = imp.find_module('_ws2812', [dirname(__file__)])
-        except ImportError:
-            import _ws2812
-            return _ws2812
-        if fp is not None:
-            try:
-                _mod = imp.load_module('_ws2812', fp, pathname, description)
-            finally:
-                fp.close()
-            return _mod
-    _ws2812 = swig_import_helper()
-    del swig_import_helper
-else:
-    import _ws2812
-del version_info
-try:
-    _swig_property = property
-except NameError:
-    pass # Python < 2.2 doesn't have 'property'.
-def _swig_setattr_nondynamic(self,class_type,name,value,static=1):
-    if (name == "thisown"): return self.this.own(value)
-    if (name == "this"):
-        if type(value).__name__ == 'SwigPyObject':
-            self.__dict__[name] = value
-            return
-    method = class_type.__swig_setmethods__.get(name,None)
-    if method: return method(self,value)
-    if (not static):
-        self.__dict__[name] = value
-    else:
-        raise AttributeError("You cannot add attributes to %s" % self)
-
-def _swig_setattr(self,class_type,name,value):
-    return _swig_setattr_nondynamic(self,class_type,name,value,0)
-
-def _swig_getattr(self,class_type,name):
-    if (name == "thisown"): return self.this.own()
-    method = class_type.__swig_getmethods__.get(name,None)
-    if method: return method(self)
-    raise AttributeError(name)
+import _ws2812
+
+_swig_property = property
 
 def _swig_repr(self):
     try: strthis = "proxy of " + self.this.__repr__()
     except: strthis = ""
     return "<%s.%s; %s >" % (self.__class__.__module__, self.__class__.__name__, strthis,)
 
-try:
-    _object = object
-    _newclass = 1
-except AttributeError:
-    class _object : pass
-    _newclass = 0
-
 
-class Color_t(_object):
-    __swig_setmethods__ = {}
-    __setattr__ = lambda self, name, value: _swig_setattr(self, Color_t, name, value)
-    __swig_getmethods__ = {}
-    __getattr__ = lambda self, name: _swig_getattr(self, Color_t, name)
+class Color_t(object):
     __repr__ = _swig_repr
-    __swig_setmethods__["r"] = _ws2812.Color_t_r_set
-    __swig_getmethods__["r"] = _ws2812.Color_t_r_get
-    if _newclass:r = _swig_property(_ws2812.Color_t_r_get, _ws2812.Color_t_r_set)
-    __swig_setmethods__["g"] = _ws2812.Color_t_g_set
-    __swig_getmethods__["g"] = _ws2812.Color_t_g_get
-    if _newclass:g = _swig_property(_ws2812.Color_t_g_get, _ws2812.Color_t_g_set)
-    __swig_setmethods__["b"] = _ws2812.Color_t_b_set
-    __swig_getmethods__["b"] = _ws2812.Color_t_b_get
-    if _newclass:b = _swig_property(_ws2812.Color_t_b_get, _ws2812.Color_t_b_set)
+    r = _swig_property(_ws2812.Color_t_r_get, _ws2812.Color_t_r_set)
+    g = _swig_property(_ws2812.Color_t_g_get, _ws2812.Color_t_g_set)
+    b = _swig_property(_ws2812.Color_t_b_get, _ws2812.Color_t_b_set)
     def __init__(self): 
         this = _ws2812.new_Color_t()
         try: self.this.append(this)